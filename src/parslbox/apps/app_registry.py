@@ -1,88 +1,110 @@
 """
 Application Registry for ParslBox
 
-This module defines the APP_FACTORY which contains the application classes
-for each supported application.
+This module defines the APP_FACTORY which maps each supported application
+to the module path of its application class. Classes are imported lazily on
+first use so that commands which only query the registry do not pay the cost
+of importing Parsl.
 """
 
+import functools
+import importlib
+
 from parslbox.apps.base import AppBase
-from parslbox.apps.lammps import LammpsApp
-from parslbox.apps.vasp import VaspApp
-from parslbox.apps.python import PythonApp
 
-# Application factory containing app classes
+# Application factory containing "module:Class" paths for each app
 APP_FACTORY = {
-    "lammps": LammpsApp,
-    "vasp": VaspApp,
-    "python": PythonApp,
+    "lammps": "parslbox.apps.lammps:LammpsApp",
+    "vasp": "parslbox.apps.vasp:VaspApp",
+    "python": "parslbox.apps.python:PythonApp",
+}
+
+# Static app metadata, served without importing the app classes.
+# Keep in sync with INPUT_REQUIRED/DFLT_INPUT on each app class.
+APP_METADATA = {
+    "lammps": {"INPUT_REQUIRED": True, "DFLT_INPUT": "in.lammps"},
+    "vasp": {"INPUT_REQUIRED": False, "DFLT_INPUT": None},
+    "python": {"INPUT_REQUIRED": True, "DFLT_INPUT": None},
 }
 
+# Shared application instances, one per app name. Apps hold no per-job
+# state, so a single instance can serve every job of that app.
+_INSTANCE_CACHE: dict[str, AppBase] = {}
+
+def _check_registered(app_name: str):
+    """Raise a ValueError listing the available apps if app_name is unknown."""
+    if app_name not in APP_FACTORY:
+        available_apps = ", ".join(APP_FACTORY.keys())
+        raise ValueError(
+            f"Unknown application: '{app_name}'. "
+            f"Available applications are: {available_apps}"
+        )
+
+@functools.lru_cache(maxsize=None)
 def get_app_class(app_name: str) -> type[AppBase]:
     """
     Get application class for a specific application.
-    
+
+    The application module is imported on first use and the resolved
+    class is cached for subsequent lookups.
+
     Args:
         app_name (str): Name of the application
-        
+
     Returns:
         type[AppBase]: Application class
-        
+
     Raises:
         ValueError: If the application is not registered
     """
-    app_class = APP_FACTORY.get(app_name)
-    
-    if app_class is None:
-        available_apps = ", ".join(APP_FACTORY.keys())
-        raise ValueError(
-            f"Unknown application: '{app_name}'. "
-            f"Available applications are: {available_apps}"
-        )
-    
-    return app_class
+    _check_registered(app_name)
+    module_name, class_name = APP_FACTORY[app_name].split(":")
+    return getattr(importlib.import_module(module_name), class_name)
 
 def get_app_instance(app_name: str) -> AppBase:
     """
     Get application instance for a specific application.
-    
+
+    Instances are created once per application and reused on later calls.
+
     Args:
         app_name (str): Name of the application
-        
+
     Returns:
         AppBase: Application instance
-        
+
     Raises:
         ValueError: If the application is not registered
     """
-    app_class = get_app_class(app_name)
-    return app_class()
+    app_instance = _INSTANCE_CACHE.get(app_name)
+    if app_instance is None:
+        app_instance = get_app_class(app_name)()
+        _INSTANCE_CACHE[app_name] = app_instance
+    return app_instance
 
 def get_app_config(app_name: str) -> dict:
     """
     Get configuration for a specific application.
-    
+
     Args:
         app_name (str): Name of the application
-        
+
     Returns:
         dict: Application configuration containing INPUT_REQUIRED and DFLT_INPUT
-        
+
     Raises:
         ValueError: If the application is not registered
     """
-    app_class = get_app_class(app_name)
-    return {
-        "INPUT_REQUIRED": app_class.INPUT_REQUIRED,
-        "DFLT_INPUT": app_class.DFLT_INPUT
-    }
+    _check_registered(app_name)
+    return dict(APP_METADATA[app_name])
 
 def is_app_registered(app_name: str) -> bool:
     """
     Check if an application is registered in the factory.
-    
+
     Args:
         app_name (str): Name of the application
-        
+
     Returns:
         bool: True if the application is registered, False otherwise
     """
@@ -91,7 +113,7 @@ def is_app_registered(app_name: str) -> bool:
 def get_registered_apps() -> list[str]:
     """
     Get list of all registered application names.
-    
+
     Returns:
         list[str]: List of registered application names
     """
@@ -7,6 +7,11 @@ providing a consistent interface for all supported applications.
 
 from abc import ABC, abstractmethod
 from pathlib import Path
+from typing import Any
+
+# Shell command used by the generated job scripts to update a job's status
+# from the worker node (see parslbox.helpers._set_status)
+UPDATE_STATUS_CMD_TEMPLATE = "python -m parslbox.helpers._set_status '{db_path}' {job_id} {status}"
 
 
 class AppBase(ABC):
@@ -14,20 +19,21 @@ class AppBase(ABC):
     Abstract base class for ParslBox applications.
     
     Each application (LAMMPS, VASP, Python, etc.) should inherit from this class
-    and implement the required methods and class attributes.
+    and implement parsl_app, check_success and the class attributes. The
+    preprocess, resolve_settings and postprocess hooks are optional.
     """
     
     # App configuration (must be defined in subclasses)
     INPUT_REQUIRED: bool
     DFLT_INPUT: str | None
     
-    @abstractmethod
     def preprocess(self, job_id: int, job_path: Path, db_path: Path, app_config: dict, config_name: str):
         """
         Preprocessing before job execution.
         
         This method is called before the main parsl_app execution.
-        Default implementation should do nothing for most apps.
+        The default implementation does nothing; override it in apps that
+        need to prepare the job directory.
         
         Args:
             job_id (int): The job ID
@@ -38,20 +44,37 @@ class AppBase(ABC):
         """
         pass
     
+    def resolve_settings(self, app_config: dict) -> Any:
+        """
+        Resolve the app configuration into the settings passed to parsl_app.
+        
+        The orchestrator calls this once per app and run, then passes the
+        result to parsl_app as app_config for every job of that app.
+        The default implementation returns app_config unchanged.
+        
+        Args:
+            app_config (dict): Application configuration from YAML
+            
+        Returns:
+            The settings handed to parsl_app
+        """
+        return app_config
+    
     @abstractmethod
     def parsl_app(self, job_id: int, job_path: Path, db_path: Path, ngpus: int, 
-                  app_config: dict, config_name: str, in_file: str, mpi_opts: str, stdout: str, stderr: str):
+                  app_config: Any, config_name: str, in_file: str, mpi_opts: str, stdout: str, stderr: str):
         """
         Main Parsl app function for executing the application.
         
-        This method should be decorated with @bash_app or @python_app.
+        This method should return the Parsl AppFuture for the job, typically by
+        calling a module-level function decorated with @bash_app or @python_app.
         
         Args:
             job_id (int): The job ID
             job_path (Path): Path to the job directory
             db_path (Path): Path to the database file
             ngpus (int): Number of GPUs allocated for this job
-            app_config (dict): Application configuration from YAML
+            app_config: Application settings, as returned by resolve_settings
             config_name (str): Name of the system configuration (e.g., 'polaris')
             in_file (str): Input filename for the job
             mpi_opts (str): Additional MPI options to append to the MPI command
@@ -78,13 +101,13 @@ class AppBase(ABC):
         """
         pass
     
-    @abstractmethod
     def postprocess(self, job_id: int, job_path: Path, db_path: Path):
         """
         Perform any post-processing after job completion.
         
         This method is called after check_success to perform any
-        cleanup or additional processing tasks.
+        cleanup or additional processing tasks. The default implementation
+        does nothing.
         
         Args:
             job_id (int): The job ID
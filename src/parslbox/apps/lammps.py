@@ -1,64 +1,26 @@
 import logging
+import mmap
+import os
 from pathlib import Path
+from typing import NamedTuple
 from parsl import bash_app
 from parslbox.helpers import database
-from parslbox.apps.base import AppBase
+from parslbox.apps.base import AppBase, UPDATE_STATUS_CMD_TEMPLATE
 from parslbox.configs.loader import get_system_config
 
+logger = logging.getLogger(__name__)
+
 # ===================================================================================
 #  LAMMPS APPLICATION-SPECIFIC IMPLEMENTATION
 # ===================================================================================
 
-class LammpsApp(AppBase):
-    """
-    LAMMPS application implementation for ParslBox.
-    
-    LAMMPS (Large-scale Atomic/Molecular Massively Parallel Simulator) is a
-    classical molecular dynamics code with a focus on materials modeling.
-    """
-    
-    # App configuration
-    INPUT_REQUIRED = True
-    DFLT_INPUT = "in.lammps"
-    
-    def preprocess(self, job_id: int, job_path: Path, db_path: Path, app_config: dict, config_name: str):
-        """
-        Preprocessing for LAMMPS jobs.
-        Currently no preprocessing is needed for LAMMPS.
-        """
-        pass
-    
-    @bash_app
-    def parsl_app(self, job_id: int, job_path: Path, db_path: Path, ngpus: int, app_config: dict, config_name: str, in_file: str, mpi_opts: str, stdout: str, stderr: str):
-        """
-        Parsl app for running a single LAMMPS simulation.
-        This function dynamically constructs the entire shell command.
-        """
-        # Derive per-job parameters
-        ntotranks = ngpus  # For LAMMPS, 1 GPU per rank
-        
-        # Get system configuration to determine GPUs per node
-        system_config = get_system_config(config_name)
-        gpus_per_node = system_config.GPUS_PER_NODE
-        
-        # Calculate ranks per node based on system and job requirements
-        rankspernode = min(ngpus, gpus_per_node)
-
-        # Unpack app configuration from the YAML file
-        executable = app_config.get('executable_path')
-        mpi_cmd = app_config.get('mpi_cmd', 'mpiexec') # Default to 'mpiexec'
-        mpi_args = app_config.get('mpi_args')
-        env_setup = app_config.get('environment_setup', '')
-        mpi_env = app_config.get('mpi_env', '') 
-        
-        # Handle mpi_opts - use empty string if None
-        mpi_opts_str = mpi_opts if mpi_opts is not None else ''
-
-        # Command to update status to 'Running' on the worker node
-        update_status_cmd = f"python -c \"from parslbox.helpers import database; database.update_jobs('{db_path}', job_ids=[{job_id}], status='Running')\""
-
-        # Construct the full command string
-        return f"""
+# Number of bytes read from the end of log.lammps when looking for the success marker
+_LOG_TAIL_BYTES = 4096
+# Line LAMMPS writes at the end of a successful run
+_SUCCESS_MARKER = b"Total wall time:"
+
+# Shell command template for a single LAMMPS job, filled in per job by _lammps_parsl_app
+_LAMMPS_CMD_TEMPLATE = """
 cd {job_path}
 
 # Environment Setup (from config.yaml)
@@ -73,32 +35,133 @@ echo "INFO: Updating job status to Running for job ID {job_id}..."
 {update_status_cmd}
 
 echo "INFO: Starting mpirun for job ID {job_id} with input file {in_file}..."
-{mpi_cmd} {mpi_args} {mpi_env} {mpi_opts_str} {executable} -k on g {ngpus} -sf kk -pk kokkos newton on neigh half -in {in_file}
+{mpi_line}
 """
 
+class _LammpsSettings(NamedTuple):
+    """LAMMPS settings from config.yaml with defaults applied."""
+    executable: str | None
+    mpi_cmd: str
+    mpi_args: str | None
+    env_setup: str
+    mpi_env: str
+
+@bash_app
+def _lammps_parsl_app(job_id: int, job_path: Path, db_path: Path, ngpus: int, settings: _LammpsSettings, config_name: str, in_file: str, mpi_opts: str, stdout: str, stderr: str):
+    """
+    Parsl app for running a single LAMMPS simulation.
+    This function dynamically constructs the entire shell command.
+    """
+    # Derive per-job parameters
+    ntotranks = ngpus  # For LAMMPS, 1 GPU per rank
+
+    # Get system configuration to determine GPUs per node
+    system_config = get_system_config(config_name)
+    gpus_per_node = system_config.GPUS_PER_NODE
+
+    # Calculate ranks per node based on system and job requirements
+    rankspernode = min(ngpus, gpus_per_node)
+
+    # Assemble the MPI launch line, skipping any unset (None/empty) parts
+    mpi_parts = [settings.mpi_cmd, settings.mpi_args, settings.mpi_env, mpi_opts, settings.executable,
+                 "-k on g", str(ngpus), "-sf kk -pk kokkos newton on neigh half -in", in_file]
+    mpi_line = " ".join(part for part in mpi_parts if part)
+
+    # Command to update status to 'Running' on the worker node
+    update_status_cmd = UPDATE_STATUS_CMD_TEMPLATE.format(db_path=db_path, job_id=job_id, status='Running')
+
+    # Construct the full command string
+    return _LAMMPS_CMD_TEMPLATE.format(
+        job_path=job_path,
+        env_setup=settings.env_setup,
+        ntotranks=ntotranks,
+        rankspernode=rankspernode,
+        job_id=job_id,
+        update_status_cmd=update_status_cmd,
+        in_file=in_file,
+        mpi_line=mpi_line,
+    )
+
+
+class LammpsApp(AppBase):
+    """
+    LAMMPS application implementation for ParslBox.
+    
+    LAMMPS (Large-scale Atomic/Molecular Massively Parallel Simulator) is a
+    classical molecular dynamics code with a focus on materials modeling.
+    """
+    
+    # App configuration
+    INPUT_REQUIRED = True
+    DFLT_INPUT = "in.lammps"
+
+    def resolve_settings(self, app_config: dict) -> _LammpsSettings:
+        """
+        Reads the LAMMPS settings from the app configuration, applying defaults.
+        """
+        return _LammpsSettings(
+            executable=app_config.get('executable_path'),
+            mpi_cmd=app_config.get('mpi_cmd', 'mpiexec'), # Default to 'mpiexec'
+            mpi_args=app_config.get('mpi_args'),
+            env_setup=app_config.get('environment_setup', ''),
+            mpi_env=app_config.get('mpi_env', ''),
+        )
+
+    def parsl_app(self, job_id: int, job_path: Path, db_path: Path, ngpus: int, app_config: _LammpsSettings, config_name: str, in_file: str, mpi_opts: str, stdout: str, stderr: str):
+        """
+        Submits a LAMMPS job to Parsl.
+        Forwards to the module-level _lammps_parsl_app so that Parsl serializes a plain
+        function reference rather than the app instance for every task.
+        """
+        return _lammps_parsl_app(
+            job_id=job_id,
+            job_path=job_path,
+            db_path=db_path,
+            ngpus=ngpus,
+            settings=app_config,
+            config_name=config_name,
+            in_file=in_file,
+            mpi_opts=mpi_opts,
+            stdout=stdout,
+            stderr=stderr,
+        )
+
     def check_success(self, job_id: int, job_path: Path, db_path: Path) -> str:
         """
-        Checks for success and updates the database with the final status.
+        Checks for success and queues the final status, which the orchestrator
+        writes with its next batch of status updates.
         """
-        logger = logging.getLogger(__name__)
-        log_file = job_path / "log.lammps"
+        # Plain string join; avoids building a Path object for every completed job.
+        log_file = os.path.join(job_path, "log.lammps")
         final_status = "Failed"  # Assume failure unless proven otherwise
 
-        if not log_file.is_file():
+        try:
+            # The success marker is written at the very end of the log, so only
+            # the tail needs to be read rather than the whole (possibly huge) file.
+            # Opening directly (instead of checking is_file() first) saves a stat
+            # on slow networked filesystems.
+            with open(log_file, 'rb') as f:
+                size = f.seek(0, os.SEEK_END)
+                f.seek(max(0, size - _LOG_TAIL_BYTES))
+                found = f.read().rfind(_SUCCESS_MARKER) != -1
+                if not found and size > _LOG_TAIL_BYTES:
+                    # Fall back to scanning the whole file (e.g. if output was written
+                    # after the marker). mmap lets the kernel page it in on demand
+                    # instead of copying it into memory, and rfind starts at the end.
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                        found = mm.rfind(_SUCCESS_MARKER) != -1
+            if found:
+                logger.info(f"Job {job_id}: Success marker found in log.lammps.")
+                final_status = "Done"
+            else:
+                logger.warning(f"Job {job_id}: Finished but success marker not found in log.lammps.")
+        except FileNotFoundError:
             logger.warning(f"Job {job_id}: Post-processing failed. log.lammps not found.")
-        else:
-            try:
-                with open(log_file, 'r') as f:
-                    if "Total wall time:" in f.read():
-                        logger.info(f"Job {job_id}: Success marker found in log.lammps.")
-                        final_status = "Done"
-                    else:
-                        logger.warning(f"Job {job_id}: Finished but success marker not found in log.lammps.")
-            except Exception as e:
-                logger.error(f"Job {job_id}: Error reading log.lammps during post-processing: {e}")
-
-        # Update the database with the final determined status
-        database.update_jobs(db_path, job_ids=[job_id], status=final_status)
+        except Exception as e:
+            logger.error(f"Job {job_id}: Error reading log.lammps during post-processing: {e}")
+
+        # Queue the final determined status
+        database.queue_status_update(db_path, job_id, final_status)
         logger.info(f"Job {job_id}: Final status set to '{final_status}'.")
 
         return final_status
@@ -106,13 +169,7 @@ echo "INFO: Starting mpirun for job ID {job_id} with input file {in_file}..."
     def postprocess(self, job_id: int, job_path: Path, db_path: Path):
         """
         Post-processing for a LAMMPS job.
-        Checks for success and updates the database with the final status.
+        The final status has already been written by check_success, so no
+        further database update is needed here.
         """
-        logger = logging.getLogger(__name__)
         logger.info(f"Job {job_id}: Post-processing started.")
-
-        # Since there's no complex check, we assume success and set status to 'Done'.
-        final_status = "Done"
-
-        database.update_jobs(db_path, job_ids=[job_id], status=final_status)
-        logger.info(f"Job {job_id}: Final status set to '{final_status}'.")
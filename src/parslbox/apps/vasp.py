@@ -1,8 +1,11 @@
 import logging
 from pathlib import Path
+from typing import NamedTuple
 from parsl import bash_app
 from parslbox.helpers import database
-from parslbox.apps.base import AppBase
+from parslbox.apps.base import AppBase, UPDATE_STATUS_CMD_TEMPLATE
+
+logger = logging.getLogger(__name__)
 
 # ===================================================================================
 #  VASP APPLICATION-SPECIFIC IMPLEMENTATION
@@ -11,6 +14,69 @@ from parslbox.apps.base import AppBase
 #  to execute VASP jobs.
 # ===================================================================================
 
+# Shell command template for a single VASP job, filled in per job by _vasp_parsl_app
+_VASP_CMD_TEMPLATE = """
+cd {job_path}
+
+# Environment Setup (from config.yaml)
+{env_setup}
+export OMP_NUM_THREADS={nthreads}
+
+# Execution
+echo "INFO: Updating job status to Running for job ID {job_id}..."
+{update_status_cmd}
+
+echo "INFO: Starting mpirun for job ID {job_id}..."
+# The VASP executable typically finds its input files (INCAR, POSCAR, etc.)
+# in the current directory.
+{mpi_line}
+"""
+
+class _VaspSettings(NamedTuple):
+    """VASP settings from config.yaml with defaults applied."""
+    env_setup: str
+    mpi_cmd: str
+    mpi_args: str | None  # None means "one rank per GPU", filled in per job
+    mpi_env: str
+    executable: str
+
+@bash_app
+def _vasp_parsl_app(job_id: int, job_path: Path, db_path: Path, ngpus: int, settings: _VaspSettings, config_name: str, in_file: str, mpi_opts: str, stdout: str, stderr: str):
+    """
+    Parsl app for running a single VASP simulation.
+
+    This function dynamically constructs the entire shell command to be executed
+    on a worker node, using settings from the config.yaml file.
+    Note: in_file parameter is accepted for consistency but VASP typically uses
+    standard input files (INCAR, POSCAR, etc.) found in the job directory.
+    """
+    # 1. Derive per-job parameters.
+    # For GPU VASP, it's common to run one MPI rank per GPU.
+    ntotranks = ngpus
+    # VASP is typically MPI-dominant; OpenMP threading is often set to 1.
+    nthreads = 1
+
+    # 2. Apply the per-job default for the MPI arguments
+    mpi_args = settings.mpi_args if settings.mpi_args is not None else f'-n {ntotranks}' # Default args
+
+    # Assemble the MPI launch line, skipping any unset (None/empty) parts
+    mpi_parts = [settings.mpi_cmd, mpi_args, settings.mpi_env, mpi_opts, settings.executable]
+    mpi_line = " ".join(part for part in mpi_parts if part)
+
+    # 3. Command to update status to 'Running' on the worker node
+    update_status_cmd = UPDATE_STATUS_CMD_TEMPLATE.format(db_path=db_path, job_id=job_id, status='Running')
+
+    # 4. Construct the full command string for VASP
+    return _VASP_CMD_TEMPLATE.format(
+        job_path=job_path,
+        env_setup=settings.env_setup,
+        nthreads=nthreads,
+        job_id=job_id,
+        update_status_cmd=update_status_cmd,
+        mpi_line=mpi_line,
+    )
+
+
 class VaspApp(AppBase):
     """
     VASP application implementation for ParslBox.
@@ -23,74 +89,51 @@ class VaspApp(AppBase):
     # App configuration
     INPUT_REQUIRED = False
     DFLT_INPUT = None
-    
-    def preprocess(self, job_id: int, job_path: Path, db_path: Path, app_config: dict, config_name: str):
+
+    def resolve_settings(self, app_config: dict) -> _VaspSettings:
         """
-        Preprocessing for VASP jobs.
-        Currently no preprocessing is needed for VASP.
+        Reads the VASP settings from the app configuration, applying defaults.
         """
-        pass
+        return _VaspSettings(
+            env_setup=app_config.get('environment_setup', ''),
+            mpi_cmd=app_config.get('mpi_cmd', 'mpiexec'), # Default to 'mpiexec'
+            mpi_args=app_config.get('mpi_args'),
+            mpi_env=app_config.get('mpi_env', ''),
+            # Default to a common VASP GPU executable name if not specified
+            executable=app_config.get('executable_path', 'vasp_gpu'),
+        )
 
-    @bash_app
-    def parsl_app(self, job_id: int, job_path: Path, db_path: Path, ngpus: int, app_config: dict, config_name: str, in_file: str, mpi_opts: str, stdout: str, stderr: str):
+    def parsl_app(self, job_id: int, job_path: Path, db_path: Path, ngpus: int, app_config: _VaspSettings, config_name: str, in_file: str, mpi_opts: str, stdout: str, stderr: str):
         """
-        Parsl app for running a single VASP simulation.
-
-        This function dynamically constructs the entire shell command to be executed
-        on a worker node, using settings from the config.yaml file.
-        Note: in_file parameter is accepted for consistency but VASP typically uses
-        standard input files (INCAR, POSCAR, etc.) found in the job directory.
+        Submits a VASP job to Parsl.
+        Forwards to the module-level _vasp_parsl_app so that Parsl serializes a plain
+        function reference rather than the app instance for every task.
         """
-        # 1. Derive per-job parameters.
-        # For GPU VASP, it's common to run one MPI rank per GPU.
-        ntotranks = ngpus
-        # VASP is typically MPI-dominant; OpenMP threading is often set to 1.
-        nthreads = 1
-
-        # 2. Unpack app configuration from the YAML file
-        env_setup = app_config.get('environment_setup', '')
-        mpi_cmd = app_config.get('mpi_cmd', 'mpiexec') # Default to 'mpiexec'
-        mpi_args = app_config.get('mpi_args', f'-n {ntotranks}') # Default args
-        mpi_env = app_config.get('mpi_env', '') 
-        # Default to a common VASP GPU executable name if not specified
-        executable = app_config.get('executable_path', 'vasp_gpu')
-        
-        # Handle mpi_opts - use empty string if None
-        mpi_opts_str = mpi_opts if mpi_opts is not None else ''
-
-        # 3. Command to update status to 'Running' on the worker node
-        update_status_cmd = f"python -c \"from parslbox.helpers import database; database.update_jobs('{db_path}', job_ids=[{job_id}], status='Running')\""
-
-        # 4. Construct the full command string for VASP
-        return f"""
-cd {job_path}
-
-# Environment Setup (from config.yaml)
-{env_setup}
-export OMP_NUM_THREADS={nthreads}
-
-# Execution
-echo "INFO: Updating job status to Running for job ID {job_id}..."
-{update_status_cmd}
-
-echo "INFO: Starting mpirun for job ID {job_id}..."
-# The VASP executable typically finds its input files (INCAR, POSCAR, etc.)
-# in the current directory.
-{mpi_cmd} {mpi_args} {mpi_env} {mpi_opts_str} {executable}
-"""
+        return _vasp_parsl_app(
+            job_id=job_id,
+            job_path=job_path,
+            db_path=db_path,
+            ngpus=ngpus,
+            settings=app_config,
+            config_name=config_name,
+            in_file=in_file,
+            mpi_opts=mpi_opts,
+            stdout=stdout,
+            stderr=stderr,
+        )
 
     def check_success(self, job_id: int, job_path: Path, db_path: Path) -> str:
         """
-        Checks for success and updates the database with the final status.
+        Checks for success and queues the final status, which the orchestrator
+        writes with its next batch of status updates.
         """
-        logger = logging.getLogger(__name__)
         logger.info(f"Job {job_id}: VASP job completed. Assuming success based on exit code.")
         
         # Since we don't have a specific output file to check for VASP jobs,
         # we rely on the bash script's exit code (handled by Parsl)
         final_status = "Done"
         
-        database.update_jobs(db_path, job_ids=[job_id], status=final_status)
+        database.queue_status_update(db_path, job_id, final_status)
         logger.info(f"Job {job_id}: Final status set to '{final_status}'.")
         
         return final_status
@@ -100,17 +143,16 @@ echo "INFO: Starting mpirun for job ID {job_id}..."
         Post-processing for a VASP job.
 
         This is a simple implementation that assumes the job was successful if
-        the Parsl app future completed without an exception. It updates the
-        database status to 'Done'.
+        the Parsl app future completed without an exception. It queues a
+        'Done' status update.
         
         A more advanced version could check for "Voluntary context switches" in
         the OUTCAR file.
         """
-        logger = logging.getLogger(__name__)
         logger.info(f"Job {job_id}: Basic post-processing started.")
 
         # Since there's no complex check, we assume success and set status to 'Done'.
         final_status = "Done"
 
-        database.update_jobs(db_path, job_ids=[job_id], status=final_status)
+        database.queue_status_update(db_path, job_id, final_status)
         logger.info(f"Job {job_id}: Final status set to '{final_status}'.")
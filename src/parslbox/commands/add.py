@@ -1,13 +1,33 @@
+import os
+import stat
 import typer
-import sqlite3
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from typing_extensions import Annotated
 from parslbox.helpers import database, path_utils
 from parslbox.apps.app_registry import get_app_config, is_app_registered
 
 app = typer.Typer()
 
+# Threads used to stat/resolve job directories. These calls are latency-bound on
+# networked filesystems (Lustre, NFS), so running them concurrently hides the RTT.
+_FS_WORKERS = 32
+
+def _validate_path(path_str: str) -> Tuple[Optional[Path], Optional[str]]:
+    """
+    Checks that path_str is an existing directory.
+    Returns (resolved_path, None) on success or (None, error_message) on failure.
+    """
+    # One stat answers both "exists" and "is a directory"
+    try:
+        st = os.stat(path_str)
+    except (FileNotFoundError, NotADirectoryError):
+        return None, f"Path '{path_str}' does not exist."
+    if not stat.S_ISDIR(st.st_mode):
+        return None, f"Path '{path_str}' is not a directory."
+    return Path(os.path.realpath(path_str)), None
+
 @app.command()
 def add(
     paths: Annotated[
@@ -90,102 +110,55 @@ def add(
     if len(paths) == 1 and paths[0].lower() == 'all':
         typer.secho("Scanning current directory for subdirectories...", fg=typer.colors.BLUE)
         current_dir = Path.cwd()
-        subdirectories = [p for p in current_dir.iterdir() if p.is_dir()]
+        # DirEntry.is_dir() uses the file type returned with the listing, so no
+        # extra stat is needed per entry (except for symlinks, which are followed)
+        with os.scandir(current_dir) as entries:
+            subdirectories = [Path(entry.path) for entry in entries if entry.is_dir()]
         
         if not subdirectories:
             typer.secho("No subdirectories found in the current directory.", fg=typer.colors.YELLOW)
             raise typer.Exit()
             
-        paths_to_add = [p.resolve() for p in subdirectories]
+        with ThreadPoolExecutor(max_workers=_FS_WORKERS) as executor:
+            paths_to_add = list(executor.map(Path.resolve, subdirectories))
         typer.secho(f"Found {len(paths_to_add)} directories to add.", fg=typer.colors.BLUE)
     else:
-        # Validate user-provided paths
-        for path_str in paths:
-            path_obj = Path(path_str)
-            if not path_obj.exists():
-                typer.secho(f"❌ Error: Path '{path_str}' does not exist.", fg=typer.colors.RED)
-                raise typer.Exit(code=1)
-            if not path_obj.is_dir():
-                typer.secho(f"❌ Error: Path '{path_str}' is not a directory.", fg=typer.colors.RED)
+        # Validate user-provided paths concurrently; results keep the input order
+        with ThreadPoolExecutor(max_workers=_FS_WORKERS) as executor:
+            results = list(executor.map(_validate_path, paths))
+
+        for resolved, error in results:
+            if error is not None:
+                typer.secho(f"❌ Error: {error}", fg=typer.colors.RED)
                 raise typer.Exit(code=1)
-            paths_to_add.append(path_obj.resolve())
+            paths_to_add.append(resolved)
 
     # --- Add the determined paths to the database ---
     success_count = 0
     fail_count = 0
 
-    for path in paths_to_add:
-        try:
-            new_id = database.add_job(
-                db_path=path_utils.DB_FILE,
-                path=str(path),
-                app=app,
-                ngpus=ngpus,
-                tag=tag,
-                in_file=final_input_file,
-                mpi_opts=mpi_opts,
-                status=status
-            )
-            input_info = f" (input: {final_input_file})" if final_input_file else " (no input file)"
-            typer.secho(f"✅ Added job '{path}' with ID {new_id}{input_info}", fg=typer.colors.GREEN)
+    rows = [
+        (str(path), app, tag, final_input_file, mpi_opts, status, ngpus)
+        for path in paths_to_add
+    ]
+    new_ids = database.add_jobs(db_path=path_utils.DB_FILE, rows=rows)
+
+    # Collect the per-job messages and write them out in one go
+    input_info = f" (input: {final_input_file})" if final_input_file else " (no input file)"
+    messages = []
+    for path, new_id in zip(paths_to_add, new_ids):
+        if new_id is not None:
+            messages.append(typer.style(f"✅ Added job '{path}' with ID {new_id}{input_info}", fg=typer.colors.GREEN))
             success_count += 1
-        except sqlite3.IntegrityError:
-            typer.secho(f"⚠️  Skipped: Job path '{path}' already exists in the database.", fg=typer.colors.YELLOW)
+        else:
+            messages.append(typer.style(f"⚠️  Skipped: Job path '{path}' already exists in the database.", fg=typer.colors.YELLOW))
             fail_count += 1
 
+    if messages:
+        typer.echo("\n".join(messages))
+
     typer.echo("---") # Separator
     if success_count > 0:
         typer.secho(f"Summary: Successfully added {success_count} job(s).", fg=typer.colors.GREEN)
     if fail_count > 0:
         typer.secho(f"Summary: Skipped {fail_count} job(s) that already existed.", fg=typer.colors.YELLOW)
-
-
-'''
-def add(
-    paths: Annotated[
-        List[Path],
-        typer.Argument(
-            help="One or more paths to the job directories.",
-            exists=True,
-            resolve_path=True,
-        ),
-    ],
-    app: Annotated[
-        str,
-        typer.Option("--app", "-a", help="The application type (e.g., 'lammps', 'vasp')."),
-    ],
-    tag: Annotated[
-        Optional[str],
-        typer.Option("--tag", "-t", help="An optional tag to categorize the job(s)."),
-    ] = None,
-    ngpus: Annotated[
-        int,
-        typer.Option("--ngpus", "-n", help="Number of GPUs required for the job(s)."),
-    ] = 1,
-):
-    """
-    Adds one or more new jobs to the database.
-    """
-    success_count = 0
-    fail_count = 0
-
-    for path in paths:
-        try:
-            new_id = database.add_job(
-                db_path=path_utils.DB_FILE,
-                path=str(path),
-                app=app,
-                ngpus=ngpus,
-                tag=tag
-            )
-            typer.secho(f"✅ Added job '{path}' with ID {new_id}", fg=typer.colors.GREEN)
-            success_count += 1
-        except sqlite3.IntegrityError:
-            typer.secho(f"❌ Error: Job path '{path}' already exists in the database.", fg=typer.colors.RED)
-            fail_count += 1
-    
-    if fail_count > 0:
-        typer.secho(f"\nSummary: {success_count} jobs added, {fail_count} failed.", fg=typer.colors.YELLOW)
-        raise typer.Exit(code=1)
-
-'''
@@ -1,3 +1,4 @@
+import sys
 import typer
 from typing import Optional
 
@@ -17,11 +18,11 @@ def filter(
     Returns space-separated job IDs matching the specified filters.
     Useful for command composition with other pbx commands.
     """
-    # Get filtered jobs from database
-    jobs = database.get_jobs(path_utils.DB_FILE, status=status, app=app_name, tag=tag, path=path, in_file=in_file)
-    
-    # Extract job IDs and print as space-separated string
-    if jobs:
-        job_ids = [str(job['job_id']) for job in jobs]
-        print(' '.join(job_ids))
+    # Get the IDs of the filtered jobs from database
+    job_ids = database.get_job_ids(path_utils.DB_FILE, status=status, app=app_name, tag=tag, path=path, in_file=in_file)
+
+    # Print job IDs as space-separated string
+    if job_ids:
+        sys.stdout.write(' '.join(map(str, job_ids)))
+        sys.stdout.write('\n')
     # If no jobs found, print nothing (silent exit)
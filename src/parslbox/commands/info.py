@@ -1,12 +1,8 @@
 import typer
 from typing import List
-from rich.console import Console
-from rich.table import Table
 
 from parslbox.helpers import database, path_utils
 
-console = Console()
-
 app = typer.Typer()
 
 @app.command()
@@ -24,21 +20,12 @@ def info(
     """
     Shows detailed information about specific jobs.
     """
-    # Get jobs from database
-    jobs = database.get_jobs_by_ids(path_utils.DB_FILE, job_ids)
-    
-    # Check if any jobs were found
-    found_job_ids = {job['job_id'] for job in jobs}
-    missing_job_ids = set(job_ids) - found_job_ids
-    
-    if missing_job_ids:
-        missing_ids_str = ", ".join(map(str, sorted(missing_job_ids)))
-        console.print(f"[yellow]⚠️ Warning: Job ID(s) {missing_ids_str} not found in database.[/yellow]")
-    
-    if not jobs:
-        console.print("[red]❌ No jobs found with the specified IDs.[/red]")
-        raise typer.Exit(code=1)
-    
+    # Imported here so other commands don't pay for loading rich
+    from rich.console import Console
+    from rich.table import Table
+
+    console = Console()
+
     # Determine which fields to show
     selected_fields = []
     if path:
@@ -75,23 +62,25 @@ def info(
         # Always include job_id when specific fields are selected
         selected_fields.insert(0, ('job_id', 'ID'))
     
+    # Get only the selected columns from database; job_id is always the first column
+    columns = [field[0] for field in selected_fields]
+    jobs, missing_job_ids = database.get_jobs_projection(path_utils.DB_FILE, job_ids, columns)
+    
+    # Report IDs that were not found (already sorted by the database)
+    if missing_job_ids:
+        missing_ids_str = ", ".join(map(str, missing_job_ids))
+        console.print(f"[yellow]⚠️ Warning: Job ID(s) {missing_ids_str} not found in database.[/yellow]")
+    
+    if not jobs:
+        console.print("[red]❌ No jobs found with the specified IDs.[/red]")
+        raise typer.Exit(code=1)
+    
     # Create and populate table
     headers = [field[1] for field in selected_fields]
     table = Table(*headers)
     
     for job in jobs:
-        row_data = []
-        for field_key, _ in selected_fields:
-            value = job[field_key]
-            if value is None:
-                row_data.append("None")
-            elif field_key == 'ngpus':
-                row_data.append(str(value))
-            elif field_key == 'job_id':
-                row_data.append(str(value))
-            else:
-                row_data.append(str(value))
-        table.add_row(*row_data)
+        table.add_row(*["None" if value is None else str(value) for value in job])
     
     console.print(table)
     
@@ -1,14 +1,29 @@
+import operator
+import sys
 import typer
 from typing import Optional
-from rich.console import Console
-from rich.table import Table
 
 from parslbox.helpers import database, path_utils
 
-console = Console()
-
 app = typer.Typer()
 
+HEADERS = ("ID", "App", "Status", "NGPUs", "Sched Job ID", "Tag", "Input", "Timestamp", "Path")
+
+# Columns read from each job row, in HEADERS order
+_get_columns = operator.itemgetter(
+    'job_id', 'app', 'status', 'ngpus', 'sched_job_id', 'tag', 'in_file', 'timestamp', 'path'
+)
+
+def format_row(job) -> tuple:
+    """Formats a job row into the display strings for each column in HEADERS."""
+    job_id, app, status, ngpus, sched_job_id, tag, in_file, timestamp, path = _get_columns(job)
+    # Display 'None' for unset optional fields
+    return (
+        str(job_id), app, status, str(ngpus),
+        sched_job_id or "None", tag or "None", in_file or "None",
+        timestamp, path,
+    )
+
 @app.command()
 def ls(
     status: Optional[str] = typer.Option(
@@ -20,33 +35,49 @@ def ls(
     tag: Optional[str] = typer.Option(
         None, "--tag", "-t", help="Filter jobs by tag."
     ),
+    limit: Optional[int] = typer.Option(
+        None, "--limit", "-L", min=1, help="Show at most this many jobs."
+    ),
+    reverse: bool = typer.Option(
+        False, "--reverse", "-r", help="Show the most recently added jobs first."
+    ),
+    plain: bool = typer.Option(
+        False, "--plain", "-P", help="Write tab-separated rows as they are read instead of a table."
+    ),
 ):
     """
     Lists all jobs in the database.
     """
-    job_list = database.get_jobs(path_utils.DB_FILE, status=status, app=app, tag=tag)
-    
+    # When piped (e.g. into grep/awk) or asked for, skip the Rich table and stream
+    # plain TSV, one row at a time straight from the database cursor
+    if plain or not sys.stdout.isatty():
+        jobs = database.iter_jobs(path_utils.DB_FILE, status=status, app=app, tag=tag, limit=limit, descending=reverse)
+        write = sys.stdout.write
+        write("\t".join(HEADERS) + "\n")
+        for job in jobs:
+            write("\t".join(format_row(job)) + "\n")
+        return
+
+    job_list = database.get_jobs(path_utils.DB_FILE, status=status, app=app, tag=tag, limit=limit, descending=reverse)
+
+    # Imported here so other commands (and piped output) don't pay for loading rich
+    from rich.console import Console
+    from rich.table import Table
+
+    console = Console()
+
     if not job_list:
         console.print("[yellow]ℹ️ No jobs found in the database.[/yellow]")
         #raise typer.Exit()
     else:
-        console.print(f"[green]# of jobs in the database: {len(job_list)}[/green]")
+        if limit is not None:
+            console.print(f"[green]# of jobs shown (limit {limit}): {len(job_list)}[/green]")
+        else:
+            console.print(f"[green]# of jobs in the database: {len(job_list)}[/green]")
 
-    # Add the new 'App', 'Tag', and 'Input' columns to the table header
-    table = Table("ID", "App", "Status", "NGPUs", "Sched Job ID", "Tag", "Input", "Timestamp", "Path")
-    
+    table = Table(*HEADERS)
     for job in job_list:
-        table.add_row(
-            str(job['job_id']),
-            job['app'],
-            job['status'],
-            str(job['ngpus']),
-            job['sched_job_id'] or "None",
-            job['tag'] or "None",  # Display 'None' if tag is None
-            job['in_file'] or "None",  # Display 'None' if in_file is None
-            job['timestamp'],
-            job['path']
-        )
-    
+        table.add_row(*format_row(job))
+
     console.print(table)
     #console.print(f"[green]Found {len(job_list)} job(s).[/green]")
@@ -1,16 +1,20 @@
+import functools
+import re
+import string
 import typer
-import subprocess
-import yaml
 from datetime import datetime
 from pathlib import Path
-from typing import Optional
+from typing import Callable, List, Optional, Tuple
 from typing_extensions import Annotated
 
-from parslbox.helpers import path_utils
+from parslbox.helpers import config_utils, path_utils
 
 
 app = typer.Typer()
 
+# Matches the whole '#PBS -l filesystems=' template line, dropped when no filesystems are given
+_FS_RE = re.compile(r'(?m)^[^\n]*#PBS -l filesystems=[^\n]*\n?')
+
 
 def minutes_to_hms(minutes: int) -> str:
     """Convert minutes to HH:MM:SS format for PBS/SLURM."""
@@ -21,21 +25,70 @@ def minutes_to_hms(minutes: int) -> str:
 
 def get_default_run_dir() -> Path:
     """Generate default run directory with current time and date in hhmmss_ddmmyy format."""
-    now = datetime.now()
-    time_str = now.strftime("%H%M%S")  # hhmmss format (hours + minutes + seconds)
-    date_str = now.strftime("%d%m%y")  # ddmmyy format
-    dir_name = f"{time_str}_{date_str}"
-    return Path.home() / ".parslbox" / "runs" / dir_name
-
-
-def load_config() -> dict:
-    """Load the parslbox configuration file."""
-    config_path = path_utils.PBX_CONFIG_FILE
-    if not config_path.is_file():
-        raise FileNotFoundError(f"Configuration file not found at: {config_path}")
-    
-    with open(config_path, 'r') as f:
-        return yaml.safe_load(f)
+    dir_name = datetime.now().strftime("%H%M%S_%d%m%y")  # hhmmss_ddmmyy
+    return path_utils.APP_DIR / "runs" / dir_name
+
+
+@functools.lru_cache(maxsize=4)
+def _pbs_renderer(template_src: str) -> Callable[[dict], str]:
+    """
+    Parse a PBS template once and return a function that fills it in from a dict.
+
+    Equivalent to template_src.format(**template_vars) for plain {name} fields.
+    Templates that use conversions, format specs or attribute/index lookups
+    fall back to str.format.
+    """
+    parsed = list(string.Formatter().parse(template_src))
+    if any(conversion or spec or (field is not None and not field.isidentifier())
+           for _, field, spec, conversion in parsed):
+        return lambda template_vars: template_src.format(**template_vars)
+
+    def render(template_vars: dict) -> str:
+        return "".join(
+            literal + (str(template_vars[field]) if field is not None else "")
+            for literal, field, _, _ in parsed
+        )
+    return render
+
+
+def build_run_options(apps: Optional[str], tags: Optional[str], retries: int) -> str:
+    """Build the 'pbx run' options string passed to the submit script."""
+    run_options = []
+    if apps:
+        run_options.append(f"--apps {apps}")
+    if tags:
+        run_options.append(f"--tags {tags}")
+    if retries > 0:
+        run_options.append(f"--retries {retries}")
+    return " ".join(run_options)
+
+
+async def _submit_async(run_dir: Path) -> Tuple[Path, int, str, str]:
+    """Run 'qsub submit.sh' in run_dir; returns (run_dir, returncode, stdout, stderr)."""
+    import asyncio
+
+    proc = await asyncio.create_subprocess_exec(
+        'qsub', 'submit.sh',
+        cwd=run_dir,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+    )
+    stdout, stderr = await proc.communicate()
+    return run_dir, proc.returncode, stdout.decode().strip(), stderr.decode().strip()
+
+
+def submit_many(run_dirs: List[Path]) -> List[Tuple[Path, int, str, str]]:
+    """
+    Submit the submit.sh script in each run directory concurrently.
+    Each qsub call is a round trip to the PBS server, so they are overlapped
+    rather than run one after another. Results are in the order of run_dirs.
+    """
+    import asyncio
+
+    async def _gather():
+        return await asyncio.gather(*(_submit_async(run_dir) for run_dir in run_dirs))
+
+    return asyncio.run(_gather())
 
 
 @app.command()
@@ -84,13 +137,17 @@ def qsub(
         int,
         typer.Option("--retries", help="Number of retries for failed tasks.")
     ] = 0,
+    batch: Annotated[
+        bool,
+        typer.Option("--batch", help="Submit one PBS job per tag in --tags, each in its own run subdirectory.")
+    ] = False,
 ):
     """
     Generate and submit a PBS job script for running parslbox workflows.
     """
     # Load configuration
     try:
-        config = load_config()
+        config = config_utils.load_config()
     except FileNotFoundError as e:
         typer.secho(f"❌ Error: {e}", fg=typer.colors.RED)
         raise typer.Exit(code=1)
@@ -112,58 +169,81 @@ def qsub(
     # Determine run directory
     if run_dir is None:
         run_dir = get_default_run_dir()
-    
-    # Create run directory
-    run_dir.mkdir(parents=True, exist_ok=True)
-    typer.secho(f"📁 Created run directory: {run_dir}", fg=typer.colors.BLUE)
+
+    # Work out the PBS job(s) to create: (run directory, tags, job name)
+    if batch:
+        tag_list = [tag for tag in (tags or '').split(',') if tag]
+        if not tag_list:
+            typer.secho("❌ Error: --batch requires at least one tag in --tags.", fg=typer.colors.RED)
+            raise typer.Exit(code=1)
+        job_specs = [(run_dir / tag, tag, f"{job_name}_{tag}") for tag in tag_list]
+    else:
+        job_specs = [(run_dir, tags, job_name)]
     
     # Convert walltime to HH:MM:SS format
     walltime_formatted = minutes_to_hms(walltime)
     
-    # Build run options string
-    run_options = []
-    if apps:
-        run_options.append(f"--apps {apps}")
-    if tags:
-        run_options.append(f"--tags {tags}")
-    if retries > 0:
-        run_options.append(f"--retries {retries}")
-    
-    run_options_str = " ".join(run_options)
-    
-    # Prepare template variables
-    template_vars = {
-        'job_name': job_name,
-        'queue': queue,
-        'select': select,
-        'walltime': walltime_formatted,
-        'filesystems': filesystems or '',
-        'project': project,
-        'python_env_setup': python_env_setup,
-        'config': config_name,
-        'run_dir': './', #str(run_dir.resolve()),  # Use absolute path for the run directory
-        'run_options': run_options_str
-    }
-    
-    # Get PBS template and format it
+    # Get PBS template
     pbs_template = config['schedulers']['pbs']['template']
     
     # Handle optional filesystems directive
     if not filesystems:
         # Remove the filesystems line if not provided
-        pbs_template = '\n'.join(line for line in pbs_template.split('\n') 
-                                if '#PBS -l filesystems=' not in line)
-    
-    submit_script = pbs_template.format(**template_vars)
+        pbs_template = _FS_RE.sub('', pbs_template)
     
-    # Write submit script
-    submit_file = run_dir / "submit.sh"
-    with open(submit_file, 'w') as f:
-        f.write(submit_script)
-    
-    typer.secho(f"📝 Generated submit script: {submit_file}", fg=typer.colors.GREEN)
+    submit_files = []
+    for job_run_dir, job_tags, pbs_job_name in job_specs:
+        # Create run directory
+        job_run_dir.mkdir(parents=True, exist_ok=True)
+        typer.secho(f"📁 Created run directory: {job_run_dir}", fg=typer.colors.BLUE)
+
+        # Prepare template variables
+        template_vars = {
+            'job_name': pbs_job_name,
+            'queue': queue,
+            'select': select,
+            'walltime': walltime_formatted,
+            'filesystems': filesystems or '',
+            'project': project,
+            'python_env_setup': python_env_setup,
+            'config': config_name,
+            'run_dir': './', #str(run_dir.resolve()),  # Use absolute path for the run directory
+            'run_options': build_run_options(apps, job_tags, retries)
+        }
+
+        submit_script = _pbs_renderer(pbs_template)(template_vars)
+
+        # Write submit script
+        submit_file = job_run_dir / "submit.sh"
+        submit_file.write_text(submit_script, encoding='utf-8')
+
+        typer.secho(f"📝 Generated submit script: {submit_file}", fg=typer.colors.GREEN)
+        submit_files.append(submit_file)
     
+    if batch:
+        # Submit all jobs concurrently
+        try:
+            results = submit_many([job_run_dir for job_run_dir, _, _ in job_specs])
+        except FileNotFoundError:
+            typer.secho("❌ Error: 'qsub' command not found. Make sure PBS is available.", fg=typer.colors.RED)
+            raise typer.Exit(code=1)
+
+        failed = 0
+        for job_run_dir, returncode, stdout, stderr in results:
+            if returncode == 0:
+                typer.secho(f"🚀 Job submitted successfully! Job ID: {stdout} (run directory: {job_run_dir})", fg=typer.colors.GREEN)
+            else:
+                typer.secho(f"❌ Error submitting job in {job_run_dir}: {stderr}", fg=typer.colors.RED)
+                failed += 1
+        if failed:
+            raise typer.Exit(code=1)
+        return
+
+    submit_file = submit_files[0]
+
     # Submit the job
+    import subprocess
+
     try:
         # Change to run directory and submit
         result = subprocess.run(
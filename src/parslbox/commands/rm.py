@@ -22,9 +22,13 @@ def rm(
     else:
         try:
             int_ids = [int(job_id) for job_id in job_ids]
-            count = database.remove_jobs_by_id(path_utils.DB_FILE, int_ids)
-            if count > 0:
-                typer.secho(f"🗑️ Removed {count} job(s).", fg=typer.colors.YELLOW)
+            removed_ids = database.remove_jobs_by_id(path_utils.DB_FILE, int_ids)
+            if removed_ids:
+                typer.secho(f"🗑️ Removed {len(removed_ids)} job(s): {', '.join(map(str, sorted(removed_ids)))}", fg=typer.colors.YELLOW)
+                removed = set(removed_ids)
+                missing_ids = [job_id for job_id in dict.fromkeys(int_ids) if job_id not in removed]
+                if missing_ids:
+                    typer.secho(f"⚠️ No jobs found with ID(s): {', '.join(map(str, missing_ids))}", fg=typer.colors.RED)
             else:
                 typer.secho("⚠️ No jobs found with the specified IDs.", fg=typer.colors.RED)
         except ValueError:
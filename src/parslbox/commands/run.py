@@ -1,15 +1,17 @@
 import typer
-import parsl
 import logging
 import os
+import queue
 import time
-import importlib
+from collections import defaultdict
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
-from typing import Optional
+from typing import NamedTuple, Optional
 from typing_extensions import Annotated
 
-from parslbox.configs.loader import load_config
+from parslbox.apps.app_registry import get_app_instance
+from parslbox.apps.base import AppBase
 from parslbox.helpers.logging_utils import setup_logging
 from parslbox.helpers.config_utils import load_app_config, is_app_configured
 from parslbox.helpers import database, path_utils
@@ -17,13 +19,43 @@ from parslbox.helpers import database, path_utils
 
 app = typer.Typer()
 
+logger = logging.getLogger(__name__)
+
+class _FutureItem(NamedTuple):
+    """A submitted Parsl task together with its job and the app that runs it."""
+    future: Future
+    job: database.Job
+    app_instance: AppBase
+
+# Threads used to run app post-processing while other jobs are still running
+POSTPROCESS_WORKERS = 8
+
+# Queued job statuses are written once no finished job is left waiting to be
+# handled, or after this many jobs during a long burst of completions
+STATUS_FLUSH_BATCH = 100
+
 def get_default_run_dir() -> Path:
     """Generate default run directory with current time and date in hhmmss_ddmmyy format."""
-    now = datetime.now()
-    time_str = now.strftime("%H%M%S")  # hhmmss format (hours + minutes + seconds)
-    date_str = now.strftime("%d%m%y")  # ddmmyy format
-    dir_name = f"{time_str}_{date_str}"
-    return Path.home() / ".parslbox" / "runs" / dir_name / "log.pbx"
+    dir_name = datetime.now().strftime("%H%M%S_%d%m%y")  # hhmmss_ddmmyy
+    return path_utils.APP_DIR / "runs" / dir_name / "log.pbx"
+
+def _finalize(job_id: int, job_path: Path, app_instance: AppBase, db_path: Path, postprocess_pool: ThreadPoolExecutor) -> Optional[Future]:
+    """
+    Checks whether a finished job succeeded, queues its final status and, on
+    success, submits its post-processing to postprocess_pool.
+
+    Returns:
+        Future: The post-processing future, or None if the job did not succeed.
+    """
+    job_status = app_instance.check_success(job_id=job_id, job_path=job_path, db_path=db_path)
+    if job_status and job_status != database.STATUS_FAILED:
+        database.queue_status_update(db_path, job_id, job_status)
+        logger.info(f"Job {job_id} execution finished. Running post-processing...")
+        return postprocess_pool.submit(app_instance.postprocess, job_id=job_id, job_path=job_path, db_path=db_path)
+    if job_status == database.STATUS_FAILED:
+        logger.error(f"Job {job_id} Failed.")
+        database.queue_status_update(db_path, job_id, database.STATUS_FAILED)
+    return None
 
 @app.command()
 def run(
@@ -51,6 +83,11 @@ def run(
     """
     Run Parsl workflows by discovering and executing application plugins.
     """
+    # Parsl and the system configs are only needed here, so they are imported
+    # when this command runs rather than on every pbx invocation
+    import parsl
+    from parslbox.configs.loader import get_config_class, load_config
+
     # 1. Initialization
     # Use default run directory if not provided
     if run_dir is None:
@@ -59,62 +96,67 @@ def run(
     run_dir.mkdir(parents=True, exist_ok=True)
     log_file = run_dir / "log.pbx"
     setup_logging(log_file=log_file)
-    logger = logging.getLogger(__name__)
     
     db_path = path_utils.DB_FILE
     
     logger.info("--- parslbox orchestrator starting ---")
     logger.info(f"Using Parsl run directory: {run_dir.resolve()}")
 
+    # The config name is checked up front, so a mistyped --config is reported
+    # even when there are no runnable jobs
     try:
-        parsl_config, scheduler = load_config(name=config_name, run_dir=run_dir, retries=retries)
-        parsl.load(parsl_config)
-        logger.info(f"Successfully loaded Parsl config '{config_name}'.")
-    except (FileNotFoundError, ValueError, parsl.errors.ConfigurationError) as e:
+        get_config_class(config_name)
+    except ValueError as e:
         logger.error(f"Failed to load Parsl configuration: {e}")
         raise typer.Exit(code=1)
 
     # 2. Job Fetching and Filtering
-    app_filter = set(apps.split(',')) if apps else None
-    tag_filter = set(tags.split(',')) if tags else None
+    # Done before loading Parsl, so a run with nothing to do never starts executors
+    # Drop empty entries, e.g. from a trailing comma in --apps/--tags
+    app_filter = frozenset(name for name in apps.split(',') if name) if apps else None
+    tag_filter = frozenset(name for name in tags.split(',') if name) if tags else None
     
-    all_runnable_jobs = database.get_jobs(db_path, status='Ready')
-    all_runnable_jobs += database.get_jobs(db_path, status='Restart')
-
-    filtered_jobs = []
-    for job in all_runnable_jobs:
-        passes_app_filter = not app_filter or job['app'] in app_filter
-        passes_tag_filter = not tag_filter or job['tag'] in tag_filter
-        if passes_app_filter and passes_tag_filter:
-            filtered_jobs.append(job)
+    # Status, app and tag filters are all applied by the database query
+    filtered_jobs = database.get_runnable_jobs(db_path, statuses=(database.STATUS_READY, database.STATUS_RESTART), apps=app_filter, tags=tag_filter)
 
     if not filtered_jobs:
         logger.info("No runnable jobs found matching the specified filters. Exiting.")
-        parsl.dfk().cleanup()
         return
 
     logger.info(f"Found {len(filtered_jobs)} jobs to execute.")
 
+    try:
+        parsl_config, scheduler = load_config(name=config_name, run_dir=run_dir, retries=retries)
+        parsl.load(parsl_config)
+        logger.info(f"Successfully loaded Parsl config '{config_name}'.")
+    except (FileNotFoundError, ValueError, parsl.errors.ConfigurationError) as e:
+        logger.error(f"Failed to load Parsl configuration: {e}")
+        raise typer.Exit(code=1)
+
     # 3. Group Jobs by Application
-    grouped_jobs = {}
+    grouped_jobs = defaultdict(list)
     for job in filtered_jobs:
-        app_name = job['app']
-        if app_name not in grouped_jobs:
-            grouped_jobs[app_name] = []
-        grouped_jobs[app_name].append(job)
+        grouped_jobs[job.app].append(job)
 
     # 4. Dynamic Plugin Loading and Execution Loop
     futures = []
+
+    # Scheduler job ID recorded for every submitted job; read once for the whole run
+    if scheduler == "PBS":
+        sched_job_id = os.environ.get('PBS_JOBID', f'local_{int(time.time())}')
+    else:
+        # Need to add clause for "SLURM" too
+        sched_job_id = None
+
     for app_name, jobs_list in grouped_jobs.items():
         logger.info(f"Processing {len(jobs_list)} jobs for application: '{app_name}'")
         try:
-            # Get app instance from registry
-            from parslbox.apps.app_registry import get_app_instance
+            # Get app instance from registry (resolved once per app and cached there)
             app_instance = get_app_instance(app_name)
         except ValueError as e:
             logger.error(f"Could not load app '{app_name}': {e}. Skipping these jobs.")
-            job_ids_to_fail = [j['job_id'] for j in jobs_list]
-            database.update_jobs(db_path, job_ids=job_ids_to_fail, status="Failed")
+            job_ids_to_fail = [j.job_id for j in jobs_list]
+            database.update_jobs(db_path, job_ids=job_ids_to_fail, status=database.STATUS_FAILED)
             continue
         
         # Load app configuration (gracefully handles missing config)
@@ -122,8 +164,8 @@ def run(
             app_config = load_app_config(app_name=app_name, system_name=config_name)
         except FileNotFoundError as e:
             logger.error(f"Configuration file error for app '{app_name}': {e}. Skipping these jobs.")
-            job_ids_to_fail = [j['job_id'] for j in jobs_list]
-            database.update_jobs(db_path, job_ids=job_ids_to_fail, status="Failed")
+            job_ids_to_fail = [j.job_id for j in jobs_list]
+            database.update_jobs(db_path, job_ids=job_ids_to_fail, status=database.STATUS_FAILED)
             continue
         
         # Log configuration status
@@ -135,73 +177,107 @@ def run(
         else:
             logger.info(f"App '{app_name}' loaded configuration for system '{config_name}'.")
 
-        # Inner submission loop for this app
+        # Settings handed to parsl_app, resolved once for the whole group
+        app_settings = app_instance.resolve_settings(app_config)
+
+        # Run preprocessing for every job of this app
         for job in jobs_list:
-            job_id = job['job_id']
-            job_path = Path(job['path'])
-            
-            logger.info(f"Submitting Job ID {job_id}...")
-            
-            # Run preprocessing
+            job_id = job.job_id
             logger.info(f"Running preprocessing for Job ID {job_id}...")
             app_instance.preprocess(
                 job_id=job_id, 
-                job_path=job_path, 
+                job_path=job.job_path, 
                 db_path=db_path, 
                 app_config=app_config, 
                 config_name=config_name
             )
-            
-            database.update_jobs(db_path, job_ids=[job_id], status="Submitted")
-            if scheduler == "PBS":
-                PBS_JOB_ID = os.environ.get('PBS_JOBID', f'local_{int(time.time())}')
-                database.update_jobs(db_path, job_ids=[job_id], sched_job_id=PBS_JOB_ID)
-            # Need to add clause for "SLURM" too
-            
-            fut = app_instance.parsl_app(
-                job_id=job_id,
-                job_path=job_path,
+
+        # Mark the whole group as submitted in one UPDATE. This must happen before
+        # the tasks are launched, or it could overwrite a 'Running' status set by
+        # a task that has already started on a worker.
+        group_job_ids = [job.job_id for job in jobs_list]
+        database.update_jobs(db_path, job_ids=group_job_ids, status=database.STATUS_SUBMITTED, sched_job_id=sched_job_id)
+
+        # Build the arguments for every job first, then submit them in one tight loop
+        submissions = [
+            dict(
+                job_id=job.job_id,
+                job_path=job.job_path,
                 db_path=db_path,
-                ngpus=job['ngpus'],
-                app_config=app_config,
+                ngpus=job.ngpus,
+                app_config=app_settings,
                 config_name=config_name,
-                in_file=job['in_file'],
-                mpi_opts=job['mpi_opts'],
-                stdout=(str(job_path / "pbx.out"), 'w'),
-                stderr=(str(job_path / "pbx.out"), 'a')
+                in_file=job.in_file,
+                mpi_opts=job.mpi_opts,
+                stdout=(job.out_file, 'w'),
+                stderr=(job.out_file, 'a')
             )
-            futures.append({'future': fut, 'job': job, 'app_instance': app_instance})
+            for job in jobs_list
+        ]
+        logger.info(f"Submitting Job IDs {', '.join(str(job.job_id) for job in jobs_list)}...")
+        parsl_app = app_instance.parsl_app
+        group_futures = [parsl_app(**kwargs) for kwargs in submissions]
+        futures.extend(
+            _FutureItem(fut, job, app_instance)
+            for fut, job in zip(group_futures, jobs_list)
+        )
 
     # 5. Await and Process Results
+    # Final statuses are queued by the apps and written from this thread in batches,
+    # together with any post-processing updates queued meanwhile
     logger.info(f"Waiting for {len(futures)} submitted jobs to complete...")
 
+    # Handle jobs in the order they finish, so a slow job does not hold up
+    # post-processing of jobs that completed after it was submitted. Each future
+    # puts itself on finished_queue when it completes, so an empty queue means no
+    # other job is ready yet. Post-processing runs in a thread pool so it overlaps
+    # with waiting on other jobs.
+    finished_queue = queue.SimpleQueue()
     for item in futures:
-        fut, job, app_instance = item['future'], item['job'], item['app_instance']
-        job_id, job_path = job['job_id'], Path(job['path'])
-        
-        try:
-            fut.result()  # Wait for the Parsl app to finish
-            job_status = app_instance.check_success(job_id=job_id, job_path=job_path, db_path=db_path)
-            if job_status and job_status != 'Failed':
-                database.update_jobs(db_path, job_ids=[job_id], status=job_status)
-                logger.info(f"Job {job_id} execution finished. Running post-processing...")
-                app_instance.postprocess(job_id=job_id, job_path=job_path, db_path=db_path)
-            elif job_status == 'Failed':
-                database.update_jobs(db_path, job_ids=[job_id], status="Failed")
-        
-        except Exception as e:      
-            logger.error(f"Job {job_id} hit following error: {e}")
-            # Sometimes apps can exit ungracefully even after a good run
-            logger.info(f"Job {job_id} checking job success...")
-            job_status = app_instance.check_success(job_id=job_id, job_path=job_path, db_path=db_path)
-            if job_status and job_status != 'Failed':
-                database.update_jobs(db_path, job_ids=[job_id], status=job_status)
-                logger.info(f"Job {job_id} completed successfully. Running post-processing...")
-                app_instance.postprocess(job_id=job_id, job_path=job_path, db_path=db_path)
-            elif job_status == 'Failed':
-                logger.error(f"Job {job_id} Failed.")
-                database.update_jobs(db_path, job_ids=[job_id], status="Failed")
-
-    # 6. Cleanup
-    parsl.dfk().cleanup()
+        item.future.add_done_callback(finished_queue.put)
+    fut_to_item = {item.future: item for item in futures}
+    postprocess_futures = {}
+    try:
+        with ThreadPoolExecutor(max_workers=POSTPROCESS_WORKERS) as postprocess_pool:
+            unflushed = 0
+            for _ in range(len(fut_to_item)):
+                fut = finished_queue.get()
+                _, job, app_instance = fut_to_item[fut]
+                job_id, job_path = job.job_id, job.job_path
+            
+                try:
+                    # The future is already done, so this returns at once
+                    fut.result()
+                except Exception as e:
+                    logger.error(f"Job {job_id} hit following error: {e}")
+                    # Sometimes apps can exit ungracefully even after a good run
+                    logger.info(f"Job {job_id} checking job success...")
+
+                try:
+                    pp_fut = _finalize(job_id, job_path, app_instance, db_path, postprocess_pool)
+                except Exception as e:
+                    # One job's check must not stop the remaining jobs from being handled
+                    logger.error(f"Job {job_id} success check failed: {e}")
+                    database.queue_status_update(db_path, job_id, database.STATUS_FAILED)
+                    pp_fut = None
+                if pp_fut is not None:
+                    postprocess_futures[pp_fut] = job_id
+
+                # Write the queued statuses in one transaction once the jobs that
+                # are ready have been handled
+                unflushed += 1
+                if unflushed >= STATUS_FLUSH_BATCH or finished_queue.empty():
+                    database.flush_status_updates()
+                    unflushed = 0
+
+        # The pool has finished every post-processing task; report any that raised
+        for pp_fut, job_id in postprocess_futures.items():
+            error = pp_fut.exception()
+            if error is not None:
+                logger.error(f"Job {job_id} post-processing failed: {error}")
+    finally:
+        # 6. Cleanup
+        # Write any job statuses still queued, including after an error or Ctrl-C
+        database.flush_status_updates()
+        parsl.dfk().cleanup()
     logger.info("--- parslbox orchestrator finished ---")
@@ -55,30 +55,3 @@ def update(
         typer.secho(f"🔄 Successfully updated {count} job(s).", fg=typer.colors.BLUE)
     else:
         typer.secho("⚠️ No jobs found with the specified IDs to update.", fg=typer.colors.YELLOW)
-
-
-'''def update(
-        status: Optional[str] = typer.Option(
-            None, "--status", "-s", help="Update job status."
-        ),
-        app: Optional[str] = typer.Option(
-            None, "--app", "-a", help="Update job app."
-        ),
-        tag: Optional[str] = typer.Option(
-            None, "--tag", "-t", help="Update job tag."
-        ),
-        ngpus: Optional[str] = typer.Option(
-            None, "--ngpus", "-n", help="Update job ngpu."
-        ),
-        job_ids: List[int] = typer.Argument(..., help="ID(s) of the job(s) to update."),
-        status: str = typer.Argument(..., help="The new status (e.g., Submitted, Completed).")
-):
-    """
-    Updates the status of one or more jobs.
-    """
-    count = database.update_job_status(path_utils.DB_FILE, job_ids, status)
-    if count > 0:
-        typer.secho(f"🔄 Updated {count} job(s) to status '{status.capitalize()}'.", fg=typer.colors.BLUE)
-    else:
-        typer.secho("⚠️ No jobs found with the specified IDs to update.", fg=typer.colors.RED)
-'''
@@ -1,19 +1,49 @@
+import functools
+import importlib
 from pathlib import Path
-from parsl.config import Config
-from parslbox.configs.base import SystemConfig
+from typing import TYPE_CHECKING
 
-# Import the system configuration classes
-from parslbox.configs.polaris import PolarisConfig
-from parslbox.configs.sophia import SophiaConfig
+if TYPE_CHECKING:
+    from parsl.config import Config
+    from parslbox.configs.base import SystemConfig
 
-# Create a dictionary that maps the config name to its configuration class
+# Create a dictionary that maps the config name to the "module:Class" path of its
+# configuration class. Modules are imported on first use, so only the selected
+# system's module (and its Parsl dependencies) is loaded.
 CONFIG_FACTORIES = {
-    "polaris": PolarisConfig,
-    "sophia": SophiaConfig,
+    "polaris": "parslbox.configs.polaris:PolarisConfig",
+    "sophia": "parslbox.configs.sophia:SophiaConfig",
     # To add a new system, create its module and add it here.
 }
 
-def load_config(name: str, run_dir: Path, retries: int) -> tuple[Config, str]:
+@functools.lru_cache(maxsize=None)
+def get_config_class(name: str) -> type["SystemConfig"]:
+    """
+    Get the system configuration class for a configuration name.
+
+    The configuration module is imported on first use and the resolved
+    class is cached for subsequent lookups.
+
+    Args:
+        name (str): The name of the configuration (e.g., "polaris").
+
+    Raises:
+        ValueError: If the requested configuration name is not found.
+
+    Returns:
+        type[SystemConfig]: The system configuration class.
+    """
+    if name not in CONFIG_FACTORIES:
+        available = ", ".join(CONFIG_FACTORIES.keys())
+        raise ValueError(
+            f"Unknown configuration name: '{name}'. "
+            f"Available configurations are: {available}"
+        )
+
+    module_name, class_name = CONFIG_FACTORIES[name].split(":")
+    return getattr(importlib.import_module(module_name), class_name)
+
+def load_config(name: str, run_dir: Path, retries: int) -> tuple["Config", str]:
     """
     Loads a Parsl configuration by name.
 
@@ -32,25 +62,18 @@ def load_config(name: str, run_dir: Path, retries: int) -> tuple[Config, str]:
     Returns:
         tuple: A tuple of (Config, scheduler_name)
     """
-    config_class = CONFIG_FACTORIES.get(name)
-
-    if config_class is None:
-        available = ", ".join(CONFIG_FACTORIES.keys())
-        raise ValueError(
-            f"Unknown configuration name: '{name}'. "
-            f"Available configurations are: {available}"
-        )
-
-    config_instance = config_class()
+    config_instance = get_config_class(name)()
     parsl_config = config_instance.get_config(run_dir=run_dir, retries=retries)
     return parsl_config, config_instance.SCHEDULER
 
-def get_system_config(name: str) -> SystemConfig:
+@functools.lru_cache(maxsize=None)
+def get_system_config(name: str) -> "SystemConfig":
     """
     Get system configuration class instance by name.
     
     This function provides access to system specifications and methods
-    for any system configuration.
+    for any system configuration. Instances are cached per name, since
+    the set of systems is small and their specifications are fixed.
     
     Args:
         name (str): The name of the system configuration (e.g., "polaris").
@@ -61,16 +84,7 @@ def get_system_config(name: str) -> SystemConfig:
     Returns:
         SystemConfig: An instance of the system configuration class.
     """
-    config_class = CONFIG_FACTORIES.get(name)
-    
-    if config_class is None:
-        available = ", ".join(CONFIG_FACTORIES.keys())
-        raise ValueError(
-            f"Unknown configuration name: '{name}'. "
-            f"Available configurations are: {available}"
-        )
-    
-    return config_class()
+    return get_config_class(name)()
 
 def get_available_systems() -> list[str]:
     """
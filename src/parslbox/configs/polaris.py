@@ -21,6 +21,13 @@ class PolarisConfig(SystemConfig):
     CORES_PER_NODE = 32
     GPUS_PER_NODE = 4
     SCHEDULER = "PBS"
+
+    # Worker CPU binding for Polaris's fixed node topology: each worker's threads are
+    # bound to the cores (and their hyperthreads) physically closest to its GPU.
+    _CPU_AFFINITY = "list:24-31,56-63:16-23,48-55:8-15,40-47:0-7,32-39"
+
+    # (nodes, total_gpus) once detected; the allocation does not change within a job
+    _resources: tuple[int, int] | None = None
     
     def detect_resources(self) -> tuple[int, int]:
         """
@@ -30,22 +37,28 @@ class PolarisConfig(SystemConfig):
         to determine the number of allocated nodes and calculates total GPUs based on
         the fixed number of GPUs per node.
 
+        The result is cached on the instance after the first call.
+
         Returns:
             tuple[int, int]: A tuple of (nodes, total_gpus)
         """
+        if self._resources is not None:
+            return self._resources
+
         node_file = os.environ.get("PBS_NODEFILE")
         
         if node_file and os.path.exists(node_file):
             with open(node_file, 'r') as f:
                 # Each line in the nodefile corresponds to a unique node
-                nodes = len(set(f.read().strip().splitlines()))
+                nodes = len({line.strip() for line in f if line.strip()})
         else:
             raise FileNotFoundError(
                 f"Node file 'PBS_NODEFILE' not found. "
                 "Polaris config expects a node list file from PBS."
                 )
         total_gpus = nodes * self.GPUS_PER_NODE
-        return nodes, total_gpus
+        self._resources = (nodes, total_gpus)
+        return self._resources
 
     def get_config(self, run_dir: Path, retries: int = 0) -> Config:
         """
@@ -80,10 +93,8 @@ class PolarisConfig(SystemConfig):
                     max_workers_per_node=self.GPUS_PER_NODE,
                     # Assign a balanced number of cores to each worker
                     cores_per_worker=cores_per_worker,
-                    # This CPU affinity string is optimized for Polaris's architecture,
-                    # ensuring each worker's threads are bound to cores physically
-                    # close to the GPU it's managing.
-                    cpu_affinity="list:24-31,56-63:16-23,48-55:8-15,40-47:0-7,32-39",
+                    # Bind each worker to the cores closest to its GPU
+                    cpu_affinity=self._CPU_AFFINITY,
                     prefetch_capacity=0,  # Recommended for GPU workloads
                     provider=LocalProvider(
                         init_blocks=1,
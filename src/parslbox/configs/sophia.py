@@ -22,46 +22,116 @@ class SophiaConfig(SystemConfig):
     CORES_PER_NODE = 128
     GPUS_PER_NODE = 8
     SCHEDULER = "PBS"
-    
+
+    # (nodes, total_gpus) once detected; the allocation does not change within a job
+    _resources: tuple[int, int] | None = None
+
+    @staticmethod
+    def _count_gpus_in_process() -> int | None:
+        """
+        Counts the GPUs visible to this process without starting a subprocess.
+
+        CUDA_VISIBLE_DEVICES is used when it lists at least one device, since it
+        names exactly the GPUs bound to the job. Otherwise (unset, empty, '-1',
+        'NoDevFiles') NVML is queried through the optional pynvml package.
+        Returns None if neither is available.
+        """
+        visible_count = 0
+        for device in os.environ.get("CUDA_VISIBLE_DEVICES", "").split(","):
+            device = device.strip()
+            # CUDA ignores everything from the first invalid entry on; '-1' and
+            # 'NoDevFiles' are the usual ways of hiding all devices
+            if not device or device == "NoDevFiles" or device.startswith("-"):
+                break
+            visible_count += 1
+        if visible_count:
+            return visible_count
+
+        try:
+            import pynvml
+        except ImportError:
+            return None
+
+        try:
+            pynvml.nvmlInit()
+            try:
+                return pynvml.nvmlDeviceGetCount()
+            finally:
+                pynvml.nvmlShutdown()
+        except pynvml.NVMLError:
+            return None
+
+    @staticmethod
+    def _start_nvidia_smi() -> subprocess.Popen | None:
+        """Starts an `nvidia-smi` GPU query in the background, or returns None if it is not installed."""
+        try:
+            # Queries one field per GPU rather than the full device listing of -L
+            return subprocess.Popen(
+                ['nvidia-smi', '--query-gpu=index', '--format=csv,noheader'],
+                stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True,
+            )
+        except FileNotFoundError:
+            return None
+
+    @staticmethod
+    def _read_nvidia_smi(proc: subprocess.Popen) -> int:
+        """Waits for a query from _start_nvidia_smi and returns its GPU count, or 0 if it failed."""
+        try:
+            stdout, _ = proc.communicate(timeout=5)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            proc.communicate()
+            return 0
+        if proc.returncode != 0:
+            return 0
+        # One non-empty line per GPU
+        return sum(1 for line in stdout.splitlines() if line.strip())
+
     def detect_resources(self) -> tuple[int, int]:
         """
         Detects the number of nodes and total GPUs for a PBS job on Sophia.
 
-        This function first attempts to use `nvidia-smi -L` to get an exact count
-        of GPUs visible to the job. If that fails, it falls back to estimating
-        the GPU count based on the number of nodes in PBS_NODEFILE.
+        This function first attempts to get an exact count of GPUs visible to the
+        job from CUDA_VISIBLE_DEVICES, NVML (pynvml, if installed) or `nvidia-smi`.
+        If that fails, it falls back to estimating the GPU count based on the number
+        of nodes in PBS_NODEFILE.
+
+        The result is cached on the instance after the first call.
 
         Returns:
             tuple[int, int]: A tuple of (nodes, total_gpus)
         """
-        # --- Get node count from PBS ---
+        if self._resources is not None:
+            return self._resources
+
         node_file = os.environ.get("PBS_NODEFILE")
-        if node_file and os.path.exists(node_file):
-            with open(node_file, 'r') as f:
-                # Use a set to count unique nodes
-                nodes = len(set(f.read().strip().splitlines()))
-        else:
+        if not (node_file and os.path.exists(node_file)):
             raise FileNotFoundError(
                 f"Node file 'PBS_NODEFILE' not found."
                 "Sophia config expects a node list file from PBS."
             )
 
-        # --- Get GPU count using nvidia-smi ---
-        try:
-            result = subprocess.run(['nvidia-smi', '-L'], capture_output=True, text=True, check=True)
-            # Count non-empty lines in the output
-            detected_gpu_count = len([line for line in result.stdout.strip().split('\n') if line.strip()])
-        except (subprocess.CalledProcessError, FileNotFoundError):
-            # If nvidia-smi fails, fallback to node-based estimation
-            detected_gpu_count = 0
+        # --- Start the GPU count; nvidia-smi, if needed, runs while the node file is read ---
+        detected_gpu_count = self._count_gpus_in_process()
+        gpu_query = self._start_nvidia_smi() if detected_gpu_count is None else None
+
+        # --- Get node count from PBS ---
+        with open(node_file, 'r') as f:
+            # Use a set to count unique nodes
+            nodes = len({line.strip() for line in f if line.strip()})
+
+        # --- Finish the GPU count; 0 falls back to node-based estimation ---
+        if detected_gpu_count is None:
+            detected_gpu_count = self._read_nvidia_smi(gpu_query) if gpu_query is not None else 0
 
         # --- Determine final GPU count ---
         if detected_gpu_count > 0:
-            return nodes, detected_gpu_count
+            total_gpus = detected_gpu_count
         else:
             # Fallback: assume a fixed number of GPUs per node on Sophia
             total_gpus = nodes * self.GPUS_PER_NODE
-            return nodes, total_gpus
+        self._resources = (nodes, total_gpus)
+        return self._resources
 
     def get_config(self, run_dir: Path, retries: int = 0) -> Config:
         """
@@ -0,0 +1,26 @@
+"""
+Minimal job status updater for compute nodes.
+
+Invoked from the generated bash commands as:
+
+    python -m parslbox.helpers._set_status <db_path> <job_id> <status>
+
+Only the standard library sqlite3 module is imported, so flipping a job to
+'Running' on a worker does not pull in the rest of parslbox.
+"""
+
+import sqlite3
+import sys
+
+
+def set_status(db_path: str, job_id: int, status: str) -> int:
+    """Sets the status of a single job and returns the number of rows updated."""
+    with sqlite3.connect(db_path) as con:
+        cur = con.execute("UPDATE jobs SET status = ?, timestamp = CURRENT_TIMESTAMP WHERE job_id = ?", (status, job_id))
+        return cur.rowcount
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 4:
+        sys.exit("Usage: python -m parslbox.helpers._set_status <db_path> <job_id> <status>")
+    set_status(sys.argv[1], int(sys.argv[2]), sys.argv[3])
@@ -1,10 +1,34 @@
-import yaml
+import functools
 import typer
 from pathlib import Path
 
 from parslbox.helpers import path_utils
 from parslbox.default_template import DEFAULT_CONFIG_YAML
 
+
+@functools.lru_cache(maxsize=4)
+def _load_yaml_cached(path_str: str, mtime_ns: int) -> dict:
+    """
+    Parses a YAML file, returning an empty dict for an empty file.
+    Cached per (path, mtime_ns), so a file is parsed at most once per change.
+    yaml is imported here so that commands which never read the config file
+    do not pay for importing it.
+    """
+    import yaml
+
+    # libyaml-backed loader when PyYAML was built with it, pure-Python otherwise
+    loader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+    with open(path_str, 'r') as f:
+        return yaml.load(f, Loader=loader) or {}
+
+def _load_full_config(config_path: Path) -> dict:
+    """
+    Returns the parsed contents of config_path, re-reading the file only if its
+    modification time has changed since the last call.
+    """
+    return _load_yaml_cached(str(config_path), config_path.stat().st_mtime_ns)
+
+
 def initialize_config_file():
     """
     Checks if the config.yaml file exists, and creates a default
@@ -32,6 +56,25 @@ def initialize_config_file():
         )
 
 
+def load_config() -> dict:
+    """
+    Loads the full parslbox configuration file.
+
+    Returns:
+        dict: The parsed configuration, shared with other callers (treat as read-only)
+
+    Raises:
+        FileNotFoundError: If the configuration file doesn't exist
+    """
+    config_path = path_utils.PBX_CONFIG_FILE
+    if not config_path.is_file():
+        # This error will now only be hit if the file was deleted after the program started.
+        # The callback should prevent this from being the user's first experience.
+        raise FileNotFoundError(f"Configuration file not found at: {config_path}")
+
+    return _load_full_config(config_path)
+
+
 def load_app_config(app_name: str, system_name: str) -> dict:
     """
     Loads the configuration for a specific application on a specific system.
@@ -49,14 +92,7 @@ def load_app_config(app_name: str, system_name: str) -> dict:
     Raises:
         FileNotFoundError: If the configuration file doesn't exist
     """
-    config_path = path_utils.PBX_CONFIG_FILE
-    if not config_path.is_file():
-        # This error will now only be hit if the file was deleted after the program started.
-        # The callback should prevent this from being the user's first experience.
-        raise FileNotFoundError(f"Configuration file not found at: {config_path}")
-
-    with open(config_path, 'r') as f:
-        full_config = yaml.safe_load(f)
+    full_config = load_config()
 
     app_configs = full_config.get(app_name)
     if not app_configs:
@@ -84,28 +120,20 @@ def is_app_configured(app_name: str, system_name: str = None) -> bool:
     Returns:
         bool: True if configuration exists, False otherwise
     """
+    import yaml
+
     try:
-        config_path = path_utils.PBX_CONFIG_FILE
-        if not config_path.is_file():
-            return False
-
-        with open(config_path, 'r') as f:
-            full_config = yaml.safe_load(f)
-
-        app_configs = full_config.get(app_name)
-        if not app_configs:
-            return False
-            
-        if system_name is None:
-            # Check if app has any configuration
-            return bool(app_configs)
-        else:
-            # Check if app has configuration for specific system
-            return bool(app_configs.get(system_name))
-            
+        # A missing file surfaces as FileNotFoundError from the stat in _load_full_config
+        app_configs = _load_full_config(path_utils.PBX_CONFIG_FILE).get(app_name)
     except (FileNotFoundError, yaml.YAMLError):
         return False
 
+    if system_name is None:
+        # Check if app has any configuration
+        return bool(app_configs)
+    # Check if app has configuration for specific system
+    return bool(app_configs and app_configs.get(system_name))
+
 
 def get_configured_systems_for_app(app_name: str) -> list[str]:
     """
@@ -117,16 +145,11 @@ def get_configured_systems_for_app(app_name: str) -> list[str]:
     Returns:
         list[str]: List of system names that have configuration for this app
     """
-    try:
-        config_path = path_utils.PBX_CONFIG_FILE
-        if not config_path.is_file():
-            return []
+    import yaml
 
-        with open(config_path, 'r') as f:
-            full_config = yaml.safe_load(f)
-
-        app_configs = full_config.get(app_name, {})
-        return list(app_configs.keys())
-        
+    try:
+        app_configs = _load_full_config(path_utils.PBX_CONFIG_FILE).get(app_name)
     except (FileNotFoundError, yaml.YAMLError):
         return []
+
+    return list(app_configs) if app_configs else []
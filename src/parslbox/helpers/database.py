@@ -1,7 +1,12 @@
+import atexit
+import os
 import sqlite3
-import typer
+import sys
+import threading
+from collections import defaultdict
+from contextlib import contextmanager
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Iterable, Iterator, NamedTuple, Optional, Tuple
 
 # Updated schema with 'app', 'tag', 'in_file', and 'mpi_opts' columns
 CREATE_TABLE_SQL = """
@@ -19,42 +24,116 @@ CREATE TABLE IF NOT EXISTS jobs (
 );
 """
 
-CREATE_TRIGGER_SQL = """
-CREATE TRIGGER IF NOT EXISTS update_jobs_timestamp
-AFTER UPDATE ON jobs
-FOR EACH ROW
-BEGIN
-    UPDATE jobs
-    SET timestamp = CURRENT_TIMESTAMP
-    WHERE job_id = OLD.job_id;
-END;
-"""
+# Columns of the jobs table, used to validate caller-supplied column names
+JOB_COLUMNS = frozenset({
+    "job_id", "app", "path", "status", "ngpus", "sched_job_id",
+    "tag", "in_file", "mpi_opts", "timestamp",
+})
+
+# Job statuses used by the CLI. Interned so that comparisons against values read
+# from the database (see _job_factory) can succeed on identity.
+STATUS_READY = sys.intern("Ready")
+STATUS_RESTART = sys.intern("Restart")
+STATUS_SUBMITTED = sys.intern("Submitted")
+STATUS_FAILED = sys.intern("Failed")
+
+# The composite index covers the runnable-job query in run (status, then optional
+# app/tag filters) and any status-only filter; app and tag are also filtered on alone.
+CREATE_INDEX_SQL = (
+    "CREATE INDEX IF NOT EXISTS idx_jobs_status_app_tag ON jobs (status, app, tag)",
+    "CREATE INDEX IF NOT EXISTS idx_jobs_app ON jobs (app)",
+    "CREATE INDEX IF NOT EXISTS idx_jobs_tag ON jobs (tag)",
+)
+
+# Older databases refreshed the timestamp with an AFTER UPDATE trigger, which issued a
+# second UPDATE per row. Every UPDATE now sets the timestamp itself.
+DROP_TRIGGER_SQL = "DROP TRIGGER IF EXISTS update_jobs_timestamp"
+
+# The database normally lives in the home directory on a shared filesystem, and workers
+# on other nodes update it (see _set_status). WAL only works when every connection is
+# on the same host, so it is opt-in: set PBX_SQLITE_WAL=1 for a database on local disk.
+USE_WAL = os.environ.get("PBX_SQLITE_WAL") == "1"
+
+# PRAGMAs applied to every new connection. The page cache is 64 MB and reads go
+# through a 256 MB mmap.
+_CONNECTION_PRAGMAS = (
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA cache_size=-64000",
+    "PRAGMA busy_timeout=5000",
+)
+
+def _connect(db_path: Path, **kwargs) -> sqlite3.Connection:
+    """Opens a connection to db_path with the standard PRAGMAs applied."""
+    con = sqlite3.connect(db_path, **kwargs)
+    for pragma in _CONNECTION_PRAGMAS:
+        con.execute(pragma)
+    if USE_WAL:
+        # With WAL, synchronous=NORMAL only syncs at checkpoints and stays crash-safe
+        con.execute("PRAGMA synchronous=NORMAL")
+    return con
+
+# Per-thread cache of open connections, keyed by database path. Every helper in this
+# module goes through it, so a process opens (and sets up) one connection per thread.
+_CONN_CACHE = threading.local()
+
+def _get_cached_connection(db_path: Path) -> sqlite3.Connection:
+    """
+    Returns a connection to db_path that is reused by later calls on the same thread.
+    The connection is in autocommit mode.
+    """
+    conns = getattr(_CONN_CACHE, 'conns', None)
+    if conns is None:
+        conns = _CONN_CACHE.conns = {}
+
+    con = conns.get(str(db_path))
+    if con is None:
+        con = _connect(db_path, isolation_level=None)
+        conns[str(db_path)] = con
+    return con
+
+@contextmanager
+def _transaction(db_path: Path) -> Iterator[sqlite3.Connection]:
+    """
+    Yields the thread's cached connection inside an explicit transaction,
+    committing when the block finishes and rolling back if it raises.
+    """
+    con = _get_cached_connection(db_path)
+    con.execute("BEGIN")
+    try:
+        yield con
+    except BaseException:
+        con.execute("ROLLBACK")
+        raise
+    con.execute("COMMIT")
 
 def initialize_database(db_path: Path):
     """
     Ensures the database directory and file exist, creating them if necessary.
-    Provides clear error handling if directory creation fails.
+
+    Raises:
+        PermissionError: If the database directory cannot be created
+        sqlite3.OperationalError: If the database cannot be opened or initialized
     """
-    try:
-        db_path.parent.mkdir(parents=True, exist_ok=True)
-    except PermissionError:
-        typer.secho(f"❌ Error: Permission denied to create directory: {db_path.parent}", fg=typer.colors.RED, err=True)
-        typer.secho(f"Please check permissions or create the directory manually: mkdir -p {db_path.parent}", fg=typer.colors.YELLOW, err=True)
-        raise typer.Exit(code=1)
-    
-    try:
-        with sqlite3.connect(db_path) as con:
-            cur = con.cursor()
-            cur.execute(CREATE_TABLE_SQL)
-            cur.execute(CREATE_TRIGGER_SQL)
-    except sqlite3.OperationalError as e:
-        typer.secho(f"❌ A database error occurred: {e}", fg=typer.colors.RED, err=True)
-        typer.secho(f"Failed to open or initialize the database at: {db_path}", fg=typer.colors.YELLOW, err=True)
-        raise typer.Exit(code=1)
-
-def add_job(db_path: Path, path: str, app: str, ngpus: int, tag: Optional[str], in_file: Optional[str] = None, mpi_opts: Optional[str] = None, status: str = 'Ready') -> int:
-    """Adds a new job to the database with app, tag, input file info, and MPI options."""
-    with sqlite3.connect(db_path) as con:
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+
+    # The journal mode is stored in the database file and inherited by later
+    # connections. It is set on every run, so unsetting PBX_SQLITE_WAL switches
+    # the file back to the rollback journal.
+    journal_mode = "WAL" if USE_WAL else "DELETE"
+    _get_cached_connection(db_path).execute(f"PRAGMA journal_mode={journal_mode}")
+    with _transaction(db_path) as con:
+        con.execute(CREATE_TABLE_SQL)
+        for index_sql in CREATE_INDEX_SQL:
+            con.execute(index_sql)
+        con.execute(DROP_TRIGGER_SQL)
+
+def add_job(db_path: Path, path: str, app: str, ngpus: int, tag: Optional[str], in_file: Optional[str] = None, mpi_opts: Optional[str] = None, status: str = STATUS_READY) -> int:
+    """
+    Adds a new job to the database with app, tag, input file info, and MPI options.
+    Public API for adding a single job; 'pbx add' inserts in bulk through add_jobs.
+    """
+    with _transaction(db_path) as con:
         cur = con.cursor()
         cur.execute(
             "INSERT INTO jobs (path, app, tag, in_file, mpi_opts, status, ngpus) VALUES (?, ?, ?, ?, ?, ?, ?)",
@@ -62,102 +141,210 @@ def add_job(db_path: Path, path: str, app: str, ngpus: int, tag: Optional[str],
         )
         return cur.lastrowid
 
-'''
-def get_jobs(db_path: Path, status_filter: Optional[str] = None) -> List[Dict[str, Any]]:
-    """Retrieves jobs from the database, optionally filtering by status."""
-    with sqlite3.connect(db_path) as con:
-        con.row_factory = sqlite3.Row
+def add_jobs(db_path: Path, rows: List[tuple]) -> List[Optional[int]]:
+    """
+    Adds several jobs in a single transaction.
+
+    Each row is a (path, app, tag, in_file, mpi_opts, status, ngpus) tuple. Rows whose
+    path is already in the database are skipped; any other constraint failure raises
+    sqlite3.IntegrityError and no rows are added.
+    Returns the new job ID for each row, or None for rows that were skipped.
+    """
+    new_ids = []
+    with _transaction(db_path) as con:
         cur = con.cursor()
-        query = "SELECT * FROM jobs"
-        params = []
-        if status_filter:
-            query += " WHERE status = ?"
-            params.append(status_filter.capitalize())
-        query += " ORDER BY job_id ASC"
-        results = cur.execute(query, params).fetchall()
-        return [dict(row) for row in results]
-'''
-
-def get_jobs(db_path: Path, status: Optional[str] = None, app: Optional[str] = None, tag: Optional[str] = None, path: Optional[str] = None, in_file: Optional[str] = None) -> List[Dict[str, Any]]:
+        # One execute per row (rather than executemany) so each row's new ID can be
+        # read back; all rows still share one transaction and a single commit.
+        for row in rows:
+            cur.execute(
+                "INSERT INTO jobs (path, app, tag, in_file, mpi_opts, status, ngpus) VALUES (?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (path) DO NOTHING",
+                row
+            )
+            new_ids.append(cur.lastrowid if cur.rowcount == 1 else None)
+    return new_ids
+
+def _build_job_filters(status: Optional[str] = None, app: Optional[str] = None, tag: Optional[str] = None, path: Optional[str] = None, in_file: Optional[str] = None, statuses: Optional[Iterable[str]] = None, apps: Optional[Iterable[str]] = None, tags: Optional[Iterable[str]] = None) -> Tuple[str, List[Any]]:
+    """
+    Builds the WHERE clause (including the keyword, or an empty string) and its
+    parameters for the job filters shared by get_jobs and get_job_ids.
+    statuses, apps and tags match any of several values (SQL IN).
+    """
+    conditions = []
+    params = []
+
+    # Multi-value filters; an empty collection matches nothing
+    for column, values in (("status", statuses), ("app", apps), ("tag", tags)):
+        if values is not None:
+            values = [value.capitalize() for value in values] if column == "status" else list(values)
+            conditions.append(f"{column} IN ({','.join('?' for _ in values)})")
+            params.extend(values)
+
+    # Dynamically add conditions and parameters for each filter if it's provided
+    if status:
+        conditions.append("status = ?")
+        params.append(status.capitalize())
+
+    if app:
+        conditions.append("app = ?")
+        params.append(app)
+
+    if tag:
+        conditions.append("tag = ?")
+        params.append(tag)
+
+    if path:
+        conditions.append("path LIKE ?")
+        params.append(f"%{path}%")
+
+    if in_file:
+        conditions.append("in_file LIKE ?")
+        params.append(f"%{in_file}%")
+
+    # If any conditions were added, join them with "AND"
+    if conditions:
+        return f" WHERE {' AND '.join(conditions)}", params
+    return "", params
+
+def iter_jobs(db_path: Path, status: Optional[str] = None, app: Optional[str] = None, tag: Optional[str] = None, path: Optional[str] = None, in_file: Optional[str] = None, limit: Optional[int] = None, descending: bool = False, statuses: Optional[Iterable[str]] = None, apps: Optional[Iterable[str]] = None, tags: Optional[Iterable[str]] = None) -> Iterator[sqlite3.Row]:
+    """
+    Yields jobs one row at a time, with the same filters and ordering as get_jobs.
+    Rows are sqlite3.Row objects (columns accessible by name) read straight from the cursor.
+    """
+    cur = _get_cached_connection(db_path).cursor()
+    cur.row_factory = sqlite3.Row  # Access columns by name
+
+    where, params = _build_job_filters(status, app, tag, path, in_file, statuses, apps, tags)
+    # Maintain a consistent order
+    query = f"SELECT * FROM jobs{where} ORDER BY job_id {'DESC' if descending else 'ASC'}"
+    if limit is not None:
+        query += " LIMIT ?"
+        params.append(limit)
+
+    yield from cur.execute(query, params)
+
+def get_jobs(db_path: Path, status: Optional[str] = None, app: Optional[str] = None, tag: Optional[str] = None, path: Optional[str] = None, in_file: Optional[str] = None, limit: Optional[int] = None, descending: bool = False, statuses: Optional[Iterable[str]] = None, apps: Optional[Iterable[str]] = None, tags: Optional[Iterable[str]] = None) -> List[sqlite3.Row]:
     """
     Retrieves jobs from the database, allowing for filtering by status, app, tag, path, and in_file.
     Filters are combined with AND logic. Path and in_file use pattern matching (LIKE).
+    statuses, apps and tags select jobs matching any of the given values.
+    Jobs are ordered by job_id (newest first if descending) and capped at limit rows if given.
+    Rows support access by column name; use dict(row) where a real dict is needed.
     """
-    with sqlite3.connect(db_path) as con:
-        con.row_factory = sqlite3.Row  # Access columns by name
-        cur = con.cursor()
-        
-        # Start with the base query and empty lists for conditions and parameters
-        base_query = "SELECT * FROM jobs"
-        conditions = []
-        params = []
-        
-        # Dynamically add conditions and parameters for each filter if it's provided
-        if status:
-            conditions.append("status = ?")
-            params.append(status.capitalize())
-        
-        if app:
-            conditions.append("app = ?")
-            params.append(app)
-
-        if tag:
-            conditions.append("tag = ?")
-            params.append(tag)
-        
-        if path:
-            conditions.append("path LIKE ?")
-            params.append(f"%{path}%")
-        
-        if in_file:
-            conditions.append("in_file LIKE ?")
-            params.append(f"%{in_file}%")
-        
-        # If any conditions were added, join them with "AND" and append to the query
-        if conditions:
-            query = f"{base_query} WHERE {' AND '.join(conditions)}"
-        else:
-            query = base_query
-        
-        # Maintain a consistent order
-        query += " ORDER BY job_id ASC"
-        
-        results = cur.execute(query, params).fetchall()
-        # Convert sqlite3.Row objects to plain dictionaries
-        return [dict(row) for row in results]
-
-def remove_jobs_by_id(db_path: Path, job_ids: List[int]) -> int:
-    """Removes jobs by their IDs and returns the number of rows deleted."""
-    with sqlite3.connect(db_path) as con:
+    return list(iter_jobs(db_path, status, app, tag, path, in_file, limit, descending, statuses, apps, tags))
+
+class Job(NamedTuple):
+    """A runnable job as used by the orchestrator, with its paths precomputed."""
+    job_id: int
+    app: str
+    ngpus: int
+    tag: Optional[str]
+    in_file: Optional[str]
+    mpi_opts: Optional[str]
+    job_path: Path
+    out_file: str
+
+def _job_factory(cursor: sqlite3.Cursor, row: tuple) -> Job:
+    """Row factory building a Job from a (job_id, app, ngpus, tag, in_file, mpi_opts, path) row."""
+    job_id, app, ngpus, tag, in_file, mpi_opts, path = row
+    job_path = Path(path)
+    # app and tag repeat across many rows and are used as grouping keys
+    return Job(
+        job_id, sys.intern(app), ngpus, tag if tag is None else sys.intern(tag),
+        in_file, mpi_opts, job_path, str(job_path / "pbx.out"),
+    )
+
+def get_runnable_jobs(db_path: Path, statuses: Iterable[str], apps: Optional[Iterable[str]] = None, tags: Optional[Iterable[str]] = None) -> List[Job]:
+    """
+    Retrieves the jobs in any of the given statuses (optionally limited to some apps
+    and tags) as Job records, ordered by job_id.
+    """
+    cur = _get_cached_connection(db_path).cursor()
+    cur.row_factory = _job_factory
+
+    where, params = _build_job_filters(statuses=statuses, apps=apps, tags=tags)
+    query = f"SELECT job_id, app, ngpus, tag, in_file, mpi_opts, path FROM jobs{where} ORDER BY job_id ASC"
+    return cur.execute(query, params).fetchall()
+
+def get_job_ids(db_path: Path, status: Optional[str] = None, app: Optional[str] = None, tag: Optional[str] = None, path: Optional[str] = None, in_file: Optional[str] = None) -> List[int]:
+    """
+    Retrieves only the IDs of jobs matching the same filters as get_jobs, in ascending order.
+    """
+    cur = _get_cached_connection(db_path).cursor()
+    cur.arraysize = 1000
+
+    where, params = _build_job_filters(status, app, tag, path, in_file)
+    cur.execute(f"SELECT job_id FROM jobs{where} ORDER BY job_id ASC", params)
+    return [row[0] for row in cur]
+
+# Maximum number of job IDs bound into a single DELETE or UPDATE statement
+DELETE_CHUNK_SIZE = 500
+
+# DELETE ... RETURNING needs SQLite 3.35; older versions select the IDs before deleting
+_HAS_RETURNING = sqlite3.sqlite_version_info >= (3, 35, 0)
+
+def remove_jobs_by_id(db_path: Path, job_ids: List[int]) -> List[int]:
+    """
+    Removes jobs by their IDs in a single transaction.
+    Returns the IDs of the jobs that were actually removed.
+    """
+    if not job_ids:
+        return []
+
+    removed = []
+    with _transaction(db_path) as con:
         cur = con.cursor()
-        cur.execute(f"DELETE FROM jobs WHERE job_id IN ({','.join('?' for _ in job_ids)})", job_ids)
-        return cur.rowcount
+        # Delete in chunks to stay well under SQLite's limit on host parameters
+        for start in range(0, len(job_ids), DELETE_CHUNK_SIZE):
+            chunk = job_ids[start:start + DELETE_CHUNK_SIZE]
+            placeholders = ','.join('?' for _ in chunk)
+            if _HAS_RETURNING:
+                cur.execute(f"DELETE FROM jobs WHERE job_id IN ({placeholders}) RETURNING job_id", chunk)
+                removed.extend(row[0] for row in cur.fetchall())
+            else:
+                cur.execute(f"SELECT job_id FROM jobs WHERE job_id IN ({placeholders})", chunk)
+                removed.extend(row[0] for row in cur.fetchall())
+                cur.execute(f"DELETE FROM jobs WHERE job_id IN ({placeholders})", chunk)
+    return removed
 
 def remove_all_jobs(db_path: Path) -> int:
     """Removes all jobs from the database."""
-    with sqlite3.connect(db_path) as con:
-        cur = con.cursor()
-        cur.execute("DELETE FROM jobs")
-        return cur.rowcount
+    return _get_cached_connection(db_path).execute("DELETE FROM jobs").rowcount
 
-def get_jobs_by_ids(db_path: Path, job_ids: List[int]) -> List[Dict[str, Any]]:
+def _load_id_table(con: sqlite3.Connection, job_ids: List[int]):
     """
-    Retrieves specific jobs from the database by their IDs.
-    Returns jobs in the same order as the provided job_ids list.
+    Fills the connection's temporary _ids table with job_ids. Queries then join
+    against it, so the SQL text stays the same whatever the number of IDs
+    (and is not bound by SQLite's limit on host parameters).
+    """
+    con.execute("CREATE TEMP TABLE IF NOT EXISTS _ids (id INTEGER PRIMARY KEY)")
+    con.execute("DELETE FROM _ids")
+    con.executemany("INSERT OR IGNORE INTO _ids (id) VALUES (?)", ((job_id,) for job_id in job_ids))
+
+def _missing_ids(con: sqlite3.Connection) -> List[int]:
+    """Returns the IDs in the _ids table that have no matching job, in ascending order."""
+    cur = con.execute(
+        "SELECT _ids.id FROM _ids LEFT JOIN jobs ON jobs.job_id = _ids.id WHERE jobs.job_id IS NULL ORDER BY _ids.id"
+    )
+    return [row[0] for row in cur]
+
+def get_jobs_projection(db_path: Path, job_ids: List[int], columns: List[str]) -> Tuple[List[tuple], List[int]]:
+    """
+    Retrieves only the given columns for specific jobs, ordered by job_id.
+    Rows are plain tuples with values in the same order as columns.
+    Returns (rows, missing_ids), where missing_ids are the requested IDs not in the database.
     """
     if not job_ids:
-        return []
-    
-    with sqlite3.connect(db_path) as con:
-        con.row_factory = sqlite3.Row
-        cur = con.cursor()
-        
-        # Create placeholders for the IN clause
-        placeholders = ','.join('?' for _ in job_ids)
-        query = f"SELECT * FROM jobs WHERE job_id IN ({placeholders}) ORDER BY job_id ASC"
-        
-        results = cur.execute(query, job_ids).fetchall()
-        return [dict(row) for row in results]
+        return [], []
+
+    unknown = [column for column in columns if column not in JOB_COLUMNS]
+    if unknown:
+        raise ValueError(f"Unknown job column(s): {', '.join(unknown)}")
+
+    with _transaction(db_path) as con:
+        _load_id_table(con, job_ids)
+        query = f"SELECT {', '.join(columns)} FROM jobs JOIN _ids ON jobs.job_id = _ids.id ORDER BY jobs.job_id ASC"
+        return con.execute(query).fetchall(), _missing_ids(con)
 
 def update_jobs(
     db_path: Path,
@@ -176,7 +363,8 @@ def update_jobs(
     if not job_ids:
         return 0
 
-    set_clauses = []
+    # The timestamp records the last change to the row
+    set_clauses = ["timestamp = CURRENT_TIMESTAMP"]
     params = []
 
     # Dynamically build the SET part of the query
@@ -209,23 +397,61 @@ def update_jobs(
         params.append(mpi_opts)
 
     # If no fields to update were provided, do nothing.
-    if not set_clauses:
+    if not params:
         return 0
 
     # Join the SET clauses with a comma
     set_statement = ", ".join(set_clauses)
-    
-    # Final parameters list includes the update values and the job IDs for the WHERE clause
-    final_params = params + job_ids
-    
-    # Build the final query
-    query = f"""
-        UPDATE jobs
-        SET {set_statement}
-        WHERE job_id IN ({','.join('?' for _ in job_ids)})
+
+    def _update_chunk(con: sqlite3.Connection, chunk: List[int]) -> int:
+        # Parameters are the update values followed by the job IDs for the WHERE clause
+        query = f"UPDATE jobs SET {set_statement} WHERE job_id IN ({','.join('?' for _ in chunk)})"
+        return con.execute(query, params + chunk).rowcount
+
+    if len(job_ids) <= DELETE_CHUNK_SIZE:
+        # A single UPDATE commits on its own in autocommit mode
+        return _update_chunk(_get_cached_connection(db_path), job_ids)
+
+    # Update in chunks to stay well under SQLite's limit on host parameters,
+    # all within one transaction
+    with _transaction(db_path) as con:
+        return sum(
+            _update_chunk(con, job_ids[start:start + DELETE_CHUNK_SIZE])
+            for start in range(0, len(job_ids), DELETE_CHUNK_SIZE)
+        )
+
+
+# Pending status updates: {db_path: {job_id: status}}
+_pending_status: Dict[Path, Dict[int, str]] = defaultdict(dict)
+_pending_lock = threading.Lock()
+
+def queue_status_update(db_path: Path, job_id: int, status: str):
     """
+    Queues a status update for a single job instead of writing it immediately.
 
-    with sqlite3.connect(db_path) as con:
-        cur = con.cursor()
-        cur.execute(query, final_params)
-        return cur.rowcount
+    Queued updates are written by the next flush_status_updates() call, with one
+    update_jobs call per status. If a job is queued more than once before a flush,
+    the latest status wins. Any updates still queued when the process exits are
+    flushed then.
+    """
+    with _pending_lock:
+        _pending_status[db_path][job_id] = status
+
+def flush_status_updates() -> int:
+    """Writes all queued status updates and returns the number of rows updated."""
+    with _pending_lock:
+        pending = dict(_pending_status)
+        _pending_status.clear()
+
+    count = 0
+    for db_path, job_statuses in pending.items():
+        # Group job IDs by status so each status is a single UPDATE
+        by_status: Dict[str, List[int]] = defaultdict(list)
+        for job_id, status in job_statuses.items():
+            by_status[status].append(job_id)
+        for status, job_ids in by_status.items():
+            count += update_jobs(db_path, job_ids=job_ids, status=status)
+    return count
+
+# Last-resort flush, so queued final statuses are not lost if the caller exits early
+atexit.register(flush_status_updates)
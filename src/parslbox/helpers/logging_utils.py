@@ -1,10 +1,30 @@
 import logging
 import sys
+import time
 
 # Get the root logger for the entire parslbox application
 # This allows any module to get this logger by name
 logger = logging.getLogger("parslbox")
 
+class CachedFormatter(logging.Formatter):
+    """
+    Formatter that reuses the formatted time string for records logged within
+    the same second, instead of calling time.strftime for every record.
+    Without a datefmt it falls back to the default (millisecond) formatting.
+    """
+    _last = (None, "")
+
+    def formatTime(self, record, datefmt=None):
+        datefmt = datefmt or self.datefmt
+        if not datefmt:
+            return super().formatTime(record)
+        sec = int(record.created)
+        last = self._last
+        if sec != last[0]:
+            # Rebind rather than mutate, so concurrent handlers never see a torn pair
+            last = self._last = (sec, time.strftime(datefmt, self.converter(sec)))
+        return last[1]
+
 def setup_logging(log_file=None):
     """
     Configures a standardized logger for the application.
@@ -21,8 +41,8 @@ def setup_logging(log_file=None):
 
     logger.setLevel(logging.INFO)
     
-    # Create a standard formatter
-    formatter = logging.Formatter(
+    # Create a standard formatter, shared by all handlers
+    formatter = CachedFormatter(
         "%(asctime)s - %(name)s - %(levelname)s - %(message)s",
         datefmt="%Y-%m-%d %H:%M:%S"
     )
@@ -38,21 +58,8 @@ def setup_logging(log_file=None):
     # --- File Handler ---
     if log_file:
         # The FileHandler will open the file and keep it open.
-        # Ensure it flushes by accessing the stream.
+        # Like any StreamHandler it flushes the stream after every record, so
+        # each message reaches the file immediately without extra wrapping.
         file_handler = logging.FileHandler(log_file, mode='a')
         file_handler.setFormatter(formatter)
-        
-        # Immediate flushing to a file.
-        # Monkey-patch the handler's stream to always flush.
-        # This ensures no buffering.
-        class UnbufferedStream:
-            def __init__(self, stream):
-                self.stream = stream
-            def write(self, data):
-                self.stream.write(data)
-                self.stream.flush()
-            def flush(self):
-                self.stream.flush()
-
-        file_handler.stream = UnbufferedStream(file_handler.stream)
         logger.addHandler(file_handler)
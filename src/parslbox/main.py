@@ -1,3 +1,4 @@
+import sqlite3
 import typer
 from parslbox.helpers import database, path_utils, config_utils
 from parslbox.commands.ls import app as list_jobs
@@ -19,7 +20,17 @@ def main_callback():
     It ensures the database directory and file are ready.
     """
     # print("DEBUG: main_callback is running, initializing database...")
-    database.initialize_database(path_utils.DB_FILE)
+    db_path = path_utils.DB_FILE
+    try:
+        database.initialize_database(db_path)
+    except PermissionError:
+        typer.secho(f"❌ Error: Permission denied to create directory: {db_path.parent}", fg=typer.colors.RED, err=True)
+        typer.secho(f"Please check permissions or create the directory manually: mkdir -p {db_path.parent}", fg=typer.colors.YELLOW, err=True)
+        raise typer.Exit(code=1)
+    except sqlite3.OperationalError as e:
+        typer.secho(f"❌ A database error occurred: {e}", fg=typer.colors.RED, err=True)
+        typer.secho(f"Failed to open or initialize the database at: {db_path}", fg=typer.colors.YELLOW, err=True)
+        raise typer.Exit(code=1)
     config_utils.initialize_config_file()
 
 # Add the 'jobs' subcommand to the main application